@@ -0,0 +1,58 @@
+using System.Diagnostics;
+using System.Text.Json;
+
+namespace parameter_study;
+
+/// <summary>
+/// Long-running mode of the simulation programs.
+/// Reads one job per line from stdin and answers each with a single prefixed JSON line on stdout,
+/// so that the runtime startup is paid only once per worker instead of once per simulation.
+/// </summary>
+static class SimulationWorker
+{
+    public const string ResponsePrefix = "#worker:";
+
+    private static readonly JsonSerializerOptions JsonOptions = new()
+    {
+        PropertyNamingPolicy = JsonNamingPolicy.SnakeCaseLower,
+    };
+
+    record Job(string Input, string Output, string WorkingDirectory);
+
+    record Result(bool Success, double Duration, string? Error);
+
+    public static void Serve(Action<string, string> simulate)
+    {
+        var initialDirectory = Directory.GetCurrentDirectory();
+
+        while (Console.In.ReadLine() is { } line)
+        {
+            if (string.IsNullOrWhiteSpace(line))
+                continue;
+
+            var job =
+                JsonSerializer.Deserialize<Job>(line, JsonOptions)
+                ?? throw new ArgumentNullException(nameof(line));
+            var stopwatch = Stopwatch.StartNew();
+            Result result;
+
+            try
+            {
+                Directory.SetCurrentDirectory(job.WorkingDirectory);
+                simulate(job.Input, job.Output);
+                result = new Result(true, stopwatch.Elapsed.TotalSeconds, null);
+            }
+            catch (Exception e)
+            {
+                result = new Result(false, stopwatch.Elapsed.TotalSeconds, e.ToString());
+            }
+            finally
+            {
+                Directory.SetCurrentDirectory(initialDirectory);
+            }
+
+            Console.Out.WriteLine(ResponsePrefix + JsonSerializer.Serialize(result, JsonOptions));
+            Console.Out.Flush();
+        }
+    }
+}
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import shutil
+from functools import cache
+from pathlib import Path
+
+from dissertation.config import in_build_dir
+
+THIS_DIR = Path(__file__).parent
+CACHE_DIR = in_build_dir(THIS_DIR / "cache")
+
+
+@cache
+def _file_hash(file: Path, mtime: float, size: int) -> str:
+    h = hashlib.sha256()
+    with file.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def solver_hash(solver: Path) -> str:
+    """Hash of all files of the solver's publish directory, identifying the solver version.
+
+    Besides the executable and its main assembly this covers the RefraSin libraries and the ``*.deps.json``, so that
+    a library update invalidates the cached outputs as well.
+    """
+    h = hashlib.sha256()
+    for f in sorted(p for p in solver.parent.rglob("*") if p.is_file()):
+        stat = f.stat()
+        h.update(f.relative_to(solver.parent).as_posix().encode())
+        h.update(_file_hash(f, stat.st_mtime, stat.st_size).encode())
+    return h.hexdigest()
+
+
+def canonical_input(input_text: str) -> str:
+    """input JSON independent of formatting and key order"""
+    return json.dumps(json.loads(input_text), sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(input_text: str, solver: Path) -> str:
+    return hashlib.sha256((solver_hash(solver) + canonical_input(input_text)).encode()).hexdigest()
+
+
+def entry_dir(key: str) -> Path:
+    return CACHE_DIR / key[:2] / key
+
+
+def _link(source: Path, target: Path):
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def restore(key: str, output_file: Path) -> float | None:
+    """place the cached output of a simulation at the given path and return its recorded duration, if cached"""
+    entry = entry_dir(key)
+    meta_file = entry / "meta.json"
+    if not meta_file.exists() or not (entry / "output.parquet").exists():
+        return None
+
+    output_file.parent.mkdir(exist_ok=True, parents=True)
+    _link(entry / "output.parquet", output_file)
+    return json.loads(meta_file.read_text())["duration"]
+
+
+def store(key: str, input_text: str, output_file: Path, duration: float):
+    """add the output of a successful simulation to the cache"""
+    entry = entry_dir(key)
+    if (entry / "meta.json").exists():
+        return
+
+    tmp = entry.with_name(f".{key}.{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    _link(output_file, tmp / "output.parquet")
+    (tmp / "input.json").write_text(canonical_input(input_text))
+    (tmp / "meta.json").write_text(json.dumps(dict(duration=duration, source=str(output_file))))
+
+    try:
+        tmp.rename(entry)
+    except OSError:
+        # another process stored the same entry in the meantime
+        shutil.rmtree(tmp, ignore_errors=True)
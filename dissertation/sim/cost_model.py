@@ -0,0 +1,241 @@
+import argparse
+import heapq
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from dissertation.config import in_build_dir
+
+THIS_DIR = Path(__file__).parent
+MODEL_FILE = in_build_dir(THIS_DIR / "cost_model.json")
+
+DEFAULT_TIME_STEP_ANGLE_LIMIT = 0.005
+DEFAULT_NECK_DELETION_LIMIT = 0.5
+
+FEATURES = [
+    "log_node_count",
+    "particle_count",
+    "log_radius_ratio",
+    "log_ovality",
+    "peak_count",
+    "log_time_step_angle_limit",
+    "log_duration",
+    "surface_remeshing",
+    "surface_deletion_limit",
+    "neck_deletion_limit",
+]
+
+
+def particles(input) -> list:
+    """particle inputs of any of the simulation families"""
+    if hasattr(input, "particles"):
+        return input.particles
+    return [input.particle1, input.particle2]
+
+
+def node_count(input) -> int:
+    return sum(p.node_count for p in particles(input))
+
+
+def features(input) -> np.ndarray:
+    """feature vector of an input model in the order of ``FEATURES``"""
+    ps = particles(input)
+    radii = [p.radius for p in ps]
+    remesher = getattr(input, "free_surface_remesher_options", None)
+
+    return np.array(
+        [
+            np.log(node_count(input)),
+            len(ps),
+            np.log(max(radii) / min(radii)),
+            max(abs(np.log(p.ovality)) for p in ps),
+            max(p.peak_count for p in ps),
+            np.log(getattr(input, "time_step_angle_limit", DEFAULT_TIME_STEP_ANGLE_LIMIT)),
+            np.log(input.duration),
+            remesher is not None,
+            remesher.deletion_limit if remesher is not None else 0,
+            getattr(input, "neck_deletion_limit", DEFAULT_NECK_DELETION_LIMIT),
+        ],
+        dtype=float,
+    )
+
+
+class CostModel(BaseModel):
+    """Log-linear least squares model of the wall time of a simulation in seconds."""
+
+    features: list[str]
+    coefficients: list[float]
+    residual_std: float
+    sample_count: int
+
+    @classmethod
+    def fit(cls, inputs: Sequence, times: Sequence[float]) -> "CostModel":
+        x = np.array([features(i) for i in inputs])
+        y = np.log(np.asarray(times, dtype=float))
+
+        mask = np.isfinite(y) & np.all(np.isfinite(x), axis=1)
+        x = np.column_stack([np.ones(mask.sum()), x[mask]])
+        y = y[mask]
+
+        coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+        residuals = y - x @ coefficients
+        residual_std = np.sqrt(np.sum(residuals**2) / max(len(y) - x.shape[1], 1))
+
+        return cls(
+            features=FEATURES,
+            coefficients=coefficients.tolist(),
+            residual_std=residual_std,
+            sample_count=len(y),
+        )
+
+    def predict(self, input) -> float:
+        """expected wall time of the simulation in seconds"""
+        log_time = self.coefficients[0] + np.dot(self.coefficients[1:], features(input))
+        return float(np.exp(log_time + self.residual_std**2 / 2))
+
+    def predict_upper(self, input, sigmas: float = 2) -> float:
+        """pessimistic wall time of the simulation in seconds"""
+        log_time = self.coefficients[0] + np.dot(self.coefficients[1:], features(input))
+        return float(np.exp(log_time + sigmas * self.residual_std))
+
+
+@cache
+def load_model(file: Path = MODEL_FILE) -> CostModel | None:
+    """fitted model from a previous build, if there is one matching the current feature set"""
+    if not file.exists():
+        return None
+
+    model = CostModel.model_validate_json(file.read_text())
+    if model.features != FEATURES:
+        return None
+    return model
+
+
+def harvest_time_files(inputs: Iterable, time_files: Iterable[Path]) -> Iterator[tuple[object, float]]:
+    for input, f in zip(inputs, time_files, strict=True):
+        if f.exists():
+            yield input, float(f.read_text())
+
+
+def harvest_batch_reports(samples: Sequence, report_files: Iterable[Path]) -> Iterator[tuple[object, float]]:
+    for f in report_files:
+        if not f.exists():
+            continue
+        for r in json.loads(f.read_text()):
+            if r["success"]:
+                yield samples[r["sample"]], r["duration"]
+
+
+def harvest_runs() -> list[tuple[object, float]]:
+    """inputs and wall times of all simulations finished so far"""
+    from dissertation.sim.packings.cases import CASES as PACKING_CASES
+    from dissertation.sim.randomized.cases import CASES as RANDOMIZED_CASES
+    from dissertation.sim.two_particle.studies import STUDIES
+
+    two_particle = [study for t in STUDIES for study in t.INSTANCES]
+    runs = [
+        *harvest_time_files([s.input for s in two_particle], [s.dir / "time.txt" for s in two_particle]),
+        *harvest_time_files([c.input for c in PACKING_CASES], [c.dir / "time.txt" for c in PACKING_CASES]),
+    ]
+    for case in RANDOMIZED_CASES:
+        runs += harvest_batch_reports(case.samples, [case.batch_report(b) for b, _ in enumerate(case.batches())])
+    return runs
+
+
+def fit_model(file: Path = MODEL_FILE) -> CostModel:
+    """Fit the model on the simulations finished so far and store it for the scheduling of later builds."""
+    runs = harvest_runs()
+    if not runs:
+        raise SystemExit("No finished simulations to fit the cost model on.")
+
+    inputs, times = zip(*runs, strict=True)
+    model = CostModel.fit(inputs, times)
+
+    file.parent.mkdir(exist_ok=True, parents=True)
+    file.write_text(model.model_dump_json(indent=4))
+    load_model.cache_clear()
+    return model
+
+
+def schedule_makespan(times: Iterable[float], workers: int) -> float:
+    """makespan of packing the given jobs longest first onto the given count of workers"""
+    loads = [0.0] * workers
+    for t in sorted(times, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + t)
+    return max(loads)
+
+
+def sweep(family: str, pending: bool) -> list:
+    """input models of the simulations of a family, optionally only those without output"""
+    if family == "two_particle":
+        from dissertation.sim.two_particle.studies import STUDIES
+
+        runs = [(study.input, study.dir) for t in STUDIES for study in t.INSTANCES]
+    elif family == "packings":
+        from dissertation.sim.packings.cases import CASES
+
+        runs = [(case.input, case.dir) for case in CASES]
+    elif family == "randomized":
+        from dissertation.sim.randomized.cases import CASES
+
+        runs = [(sample, case.dir(i)) for case in CASES for i, sample in enumerate(case.samples)]
+    else:
+        raise ValueError(f"Unknown simulation family {family}.")
+
+    return [input for input, d in runs if not pending or not (d / "output.parquet").exists()]
+
+
+def report(families: Sequence[str], workers: int, budget: float, pending: bool):
+    model = load_model()
+    if model is None:
+        raise SystemExit(f"No cost model found at {MODEL_FILE}, fit it first with '--fit'.")
+
+    print(f"Cost model fitted on {model.sample_count} simulations, residual std {model.residual_std:.2f} (log).")
+
+    expected = []
+    upper = []
+    for family in families:
+        inputs = sweep(family, pending)
+        expected_family = [model.predict(i) for i in inputs]
+        expected += expected_family
+        upper += [model.predict_upper(i) for i in inputs]
+        print(f"{family}: {len(inputs)} simulations, {sum(expected_family) / 3600:.1f} h in total")
+
+    makespan = schedule_makespan(expected, workers)
+    makespan_upper = schedule_makespan(upper, workers)
+    print(
+        f"Expected makespan on {workers} workers: {makespan / 3600:.1f} h (pessimistic {makespan_upper / 3600:.1f} h)"
+    )
+
+    if makespan_upper <= budget:
+        print(f"Fits into the budget of {budget / 3600:.1f} h.")
+    elif makespan <= budget:
+        print(f"Probably fits into the budget of {budget / 3600:.1f} h, but without margin.")
+    else:
+        print(f"Does not fit into the budget of {budget / 3600:.1f} h.")
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Predict whether a simulation sweep fits into a time budget.")
+    parser.add_argument(
+        "families", nargs="*", default=["two_particle", "packings", "randomized"], help="simulation families"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=1, help="count of parallel workers")
+    parser.add_argument("-b", "--budget", type=float, default=10, help="time budget in hours")
+    parser.add_argument("-p", "--pending", action="store_true", help="only count simulations without output")
+    parser.add_argument("--fit", action="store_true", help="refit the model on the simulations finished so far")
+    args = parser.parse_args(argv)
+
+    if args.fit:
+        model = fit_model()
+        print(f"Fitted the cost model on {model.sample_count} simulations.")
+
+    report(args.families, args.workers, args.budget * 3600, args.pending)
+
+
+if __name__ == "__main__":
+    main()
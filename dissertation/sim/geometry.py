@@ -0,0 +1,10 @@
+import numpy as np
+
+
+def distance(particle1_x, particle1_y, particle2_x, particle2_y):
+    return np.sqrt((particle2_x - particle1_x) ** 2 + (particle2_y - particle1_y) ** 2)
+
+
+def shoelace(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """signed areas of polygons given by their vertex coordinates along the last axis, e.g. states × vertices"""
+    return np.sum((x - np.roll(x, -1, axis=-1)) * (y + np.roll(y, -1, axis=-1)), axis=-1) / 2
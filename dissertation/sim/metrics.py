@@ -0,0 +1,129 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dissertation.sim.geometry import distance, shoelace
+from dissertation.sim.output import pivot_by_particle
+from dissertation.sim.summary import read_summary, state_summary, summarize
+
+Curve = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Normalization and particle selection of the metrics of one simulation."""
+
+    time_norm: float
+    radius: float
+    particles: tuple[bytes, ...]
+    neck_particles: tuple[bytes, ...] | None = None
+    """particles whose grain boundary nodes define the neck size, all if None"""
+    polygon_shrinkage: Literal["area", "sqrt_area"] = "area"
+    """measure of the polygon of particle centers defining the shrinkage of more than two particles"""
+
+
+def fingerprint(file: Path) -> tuple[str, int, int]:
+    stat = file.stat()
+    return str(file.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=16)
+def _load(fingerprint: tuple[str, int, int]) -> pa.Table:
+    file = Path(fingerprint[0])
+    if file.name == "output.parquet":
+        return summarize(file)
+    return read_summary(file)
+
+
+def neck_size(summary: pa.Table, spec: MetricSpec) -> Curve:
+    if spec.neck_particles is None:
+        states = state_summary(summary)
+    else:
+        states = state_summary(summary.filter(pc.field("Particle.Id").isin(spec.neck_particles)))
+    states = states.filter(pc.field("GrainBoundary.Count") > 0)
+
+    times = states["State.Time"].to_numpy() / spec.time_norm
+    mask = np.diff(times, prepend=[0]) > 0
+    neck_sizes = (
+        (states["GrainBoundary.ToUpper"].to_numpy() + states["GrainBoundary.ToLower"].to_numpy())
+        / states["GrainBoundary.Count"].to_numpy()
+        / spec.radius
+        / 2
+    )
+
+    return times[mask], neck_sizes[mask]
+
+
+def shrinkage(summary: pa.Table, spec: MetricSpec) -> Curve:
+    times, states = pivot_by_particle(summary, spec.particles, ["Particle.Coordinates.X", "Particle.Coordinates.Y"])
+    x, y = states["Particle.Coordinates.X"], states["Particle.Coordinates.Y"]
+
+    times = times / spec.time_norm
+    mask = np.diff(times, prepend=[0]) > 0
+
+    if len(spec.particles) == 2:
+        distances = distance(x[:, 0], y[:, 0], x[:, 1], y[:, 1])
+        shrinkages = (distances[0] - distances[mask]) / distances[0]
+    else:
+        areas = shoelace(x, y)
+        if spec.polygon_shrinkage == "sqrt_area":
+            areas = np.sqrt(areas)
+        shrinkages = (areas[0] - areas[mask]) / areas[0]
+
+    return times[mask], shrinkages
+
+
+def volume_loss(summary: pa.Table, spec: MetricSpec) -> dict[bytes, Curve]:
+    """relative volume loss per particle"""
+    times, states = pivot_by_particle(summary, spec.particles, ["Particle.Volume"])
+    volumes = states["Particle.Volume"]
+    mask = (times > 0) & (np.diff(times, prepend=[0]) > 0)
+    losses = (volumes[mask] - volumes[0]) / volumes[0]
+
+    return {p: (times[mask] / spec.time_norm, losses[:, i]) for i, p in enumerate(spec.particles)}
+
+
+def time_steps(summary: pa.Table, spec: MetricSpec) -> Curve:
+    times = state_summary(summary)["State.Time"].to_numpy() / spec.time_norm
+    diffs = np.diff(times, append=[0])
+    mask = diffs > 0
+
+    return times[mask], diffs[mask]
+
+
+def step_count(summary: pa.Table, spec: MetricSpec) -> int:
+    times = state_summary(summary)["State.Time"].to_numpy()
+    return int(np.count_nonzero(np.diff(times, prepend=[0]) > 0))
+
+
+METRICS: dict[str, Callable[[pa.Table, MetricSpec], object]] = dict(
+    neck_size=neck_size,
+    shrinkage=shrinkage,
+    volume_loss=volume_loss,
+    time_steps=time_steps,
+    step_count=step_count,
+)
+
+
+@lru_cache(maxsize=1024)
+def _extract(fingerprint: tuple[str, int, int], sample: int | None, spec: MetricSpec, metric: str):
+    summary = _load(fingerprint)
+    if sample is not None:
+        summary = summary.filter(pc.field("Sample") == sample)
+    return METRICS[metric](summary, spec)
+
+
+def extract(file: Path, spec: MetricSpec, metrics: Sequence[str], sample: int | None = None) -> dict:
+    """Compute the requested metrics of a simulation from one pass over its output.
+
+    The file may be a raw output, which is summarized once, or a (batch) summary. Results are memoized per file
+    fingerprint, so that several tasks or figures requesting metrics of the same unchanged file share the work.
+    """
+    key = fingerprint(file)
+    return {m: _extract(key, sample, spec, m) for m in metrics}
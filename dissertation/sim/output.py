@@ -0,0 +1,130 @@
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+GRAIN_BOUNDARY = 1
+
+STATE_COLUMNS = ["State.Id", "State.Time"]
+PARTICLE_COLUMNS = ["Particle.Id", "Particle.Coordinates.X", "Particle.Coordinates.Y"]
+NODE_COORDINATE_COLUMNS = ["Node.Coordinates.X", "Node.Coordinates.Y"]
+
+STREAM_BATCH_SIZE = 1 << 17
+FLAT_CACHE_SUFFIX = ".arrow"
+
+
+def column(name: str) -> pc.Expression:
+    """expression referencing a nested column of the simulation output by its flattened name, e.g. ``State.Time``"""
+    return pc.field(*name.split("."))
+
+
+def read_output(file: Path, columns: Sequence[str], filter: pc.Expression | None = None) -> pa.Table:
+    """Read a simulation output with only the given nested columns and rows matching the filter.
+
+    The projection and filter are pushed down into the Parquet scan, so that only the needed column chunks are read
+    and row groups are skipped based on their statistics. The result has the flattened column names, as
+    ``pq.read_table(file).flatten().flatten()`` would have.
+
+    Flat caches written by :func:`write_flat_cache` are memory-mapped instead, filters on them refer to the
+    flattened names, e.g. ``pc.field("State.Time")``.
+    """
+    if file.suffix == FLAT_CACHE_SUFFIX:
+        table = read_flat_cache(file, columns)
+        return table if filter is None else table.filter(filter)
+    return ds.dataset(file, format="parquet").to_table(columns={c: column(c) for c in columns}, filter=filter)
+
+
+def iter_output(
+    file: Path, columns: Sequence[str], filter: pc.Expression | None = None, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[pa.RecordBatch]:
+    """Stream a simulation output as record batches with the flattened columns of :func:`read_output`.
+
+    Row groups are scanned one after another without read-ahead, so that memory is bounded by the batch size
+    instead of the length of the simulation.
+    """
+    if file.suffix == FLAT_CACHE_SUFFIX:
+        for batch in read_flat_cache(file, columns).to_batches(max_chunksize=batch_size):
+            yield batch if filter is None else batch.filter(filter)
+        return
+
+    yield from ds.dataset(file, format="parquet").to_batches(
+        columns={c: column(c) for c in columns},
+        filter=filter,
+        batch_size=batch_size,
+        batch_readahead=0,
+        fragment_readahead=0,
+        use_threads=False,
+    )
+
+
+def flat_columns(schema: pa.Schema) -> list[str]:
+    """flattened names of all leaf columns of a nested output schema"""
+
+    def leaves(field: pa.Field, prefix: str) -> Iterator[str]:
+        if pa.types.is_struct(field.type):
+            for child in field.type:
+                yield from leaves(child, f"{prefix}{field.name}.")
+        else:
+            yield prefix + field.name
+
+    return [c for f in schema for c in leaves(f, "")]
+
+
+def write_flat_cache(file: Path, cache_file: Path):
+    """Convert a simulation output once to an uncompressed Arrow IPC file with flattened columns.
+
+    The conversion streams the output batch by batch. Readers memory-map the cache, so that repeated reads are served
+    from the page cache without decompression or allocation of flattened column buffers.
+    """
+    columns = flat_columns(pq.read_schema(file))
+    batches = iter_output(file, columns)
+    first = next(batches, None)
+    schema = read_output(file, columns).schema if first is None else first.schema
+
+    with pa.ipc.new_file(cache_file, schema, options=pa.ipc.IpcWriteOptions(compression=None)) as writer:
+        if first is not None:
+            writer.write_batch(first)
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+def read_flat_cache(file: Path, columns: Sequence[str]) -> pa.Table:
+    """zero-copy table of the given columns of a memory-mapped flat cache"""
+    return pa.ipc.open_file(pa.memory_map(str(file))).read_all().select(list(columns))
+
+
+def pivot_by_particle(
+    table: pa.Table, particle_ids: Sequence[bytes], columns: Sequence[str]
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Arrange rows of states and particles as dense states × particles arrays in a single pass.
+
+    The table must hold at most one row per state and particle, as a summary or a group by ``State.Id`` and
+    ``Particle.Id`` does. States are ordered by time and id, columns ``i`` correspond to ``particle_ids[i]``. Returns the
+    state times and an array per column, holding NaN, or None for list columns, where a particle is missing.
+    """
+    table = table.sort_by([("State.Time", "ascending"), ("State.Id", "ascending")])
+    state_index = pc.dictionary_encode(table["State.Id"]).combine_chunks().indices.to_numpy()
+    particle_index = pc.index_in(
+        table["Particle.Id"], value_set=pa.array(particle_ids, table.schema.field("Particle.Id").type)
+    )
+    particle_index = pc.fill_null(particle_index, -1).to_numpy()
+    known = particle_index >= 0
+
+    state_count = state_index.max(initial=-1) + 1
+    times = np.empty(state_count)
+    times[state_index] = table["State.Time"].to_numpy()
+
+    pivoted = {}
+    for c in columns:
+        values = table[c].to_numpy(zero_copy_only=False)
+        is_list = pa.types.is_list(table.schema.field(c).type)
+        pivoted[c] = np.full(
+            (state_count, len(particle_ids)), None if is_list else np.nan, dtype=object if is_list else float
+        )
+        pivoted[c][state_index[known], particle_index[known]] = values[known]
+
+    return times, pivoted
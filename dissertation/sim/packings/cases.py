@@ -5,6 +5,7 @@ import numpy as np
 from pydantic import BaseModel, ConfigDict
 
 from dissertation.config import ROOT_NAMESPACE_UUID, in_build_dir
+from dissertation.sim.metrics import MetricSpec
 from dissertation.sim.packings.input import (
     Input,
     InterfaceInput,
@@ -64,6 +65,15 @@ class Case(BaseModel):
     def dir(self) -> Path:
         return in_build_dir(THIS_DIR / "cases") / self.key
 
+    @property
+    def metric_spec(self) -> MetricSpec:
+        return MetricSpec(
+            time_norm=self.input.time_norm_surface,
+            radius=self.input.particles[0].radius,
+            particles=tuple(p.id.bytes for p in self.input.particles),
+            polygon_shrinkage="sqrt_area",
+        )
+
 
 _COMMON_STYLE = dict()
 
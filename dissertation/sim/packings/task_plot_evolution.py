@@ -1,15 +1,14 @@
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import pyarrow as pa
-import pyarrow.compute as pc
-import pyarrow.parquet as pq
 from matplotlib.contour import ContourSet
 from matplotlib.ticker import LogLocator
 from pytask import mark, task
 
 from dissertation.config import image_produces
 from dissertation.sim.packings.cases import CASES, Case
+from dissertation.sim.state_index import index_file, load_state_index, read_particle_outlines
 
 for case in CASES:
 
@@ -17,17 +16,16 @@ for case in CASES:
     @mark.plot
     def task_plot_evolution_packings(
         case: Case = case,
-        results_file=case.dir / "output.parquet",
+        results_file=case.dir / "output.arrow",
+        state_index=index_file(case.dir / "output.arrow"),
         produces=image_produces(case.dir / "evolution"),
     ):
-        df = pq.read_table(results_file).flatten().flatten()
-
         fig = plt.figure()
         ax = fig.subplots()
         ax.set_aspect("equal", adjustable="datalim")
         ax.grid(True)
 
-        particles = [get_states(df, case, i) for i in range(len(case.input.particles))]
+        particles = get_states(results_file, state_index, case)
         times = particles[0][0]
 
         times_to_plot = np.geomspace(1e-6, times[-1], 10)
@@ -74,18 +72,12 @@ for case in CASES:
         plt.close(fig)
 
 
-def get_states(df: pa.Table, case: Case, particle_index: int):
-    particle: pd.DataFrame = (
-        df.filter(pc.field("Particle.Id") == case.input.particles[particle_index].id.bytes)
-        .group_by(["State.Id"])
-        .aggregate([("State.Time", "one"), ("Node.Coordinates.X", "list"), ("Node.Coordinates.Y", "list")])
-        .sort_by("State.Time_one")
-        .to_pandas()
-    )
+def get_states(results_file: Path, state_index: Path, case: Case):
+    index = load_state_index(state_index)
+    positions = np.flatnonzero(index.monotonic & (index.times > 1))
+    times, x, y = read_particle_outlines(results_file, [p.id.bytes for p in case.input.particles], index, positions)
 
-    mask = (particle["State.Time_one"] > 1) & (np.diff(particle["State.Time_one"], prepend=[0]) > 0)
-    times = particle["State.Time_one"][mask] / case.input.time_norm_surface
-    particle_x = particle["Node.Coordinates.X_list"] * 1e6
-    particle_y = particle["Node.Coordinates.Y_list"] * 1e6
+    times = times / case.input.time_norm_surface
+    x, y = x * 1e6, y * 1e6
 
-    return times.array, particle_x.array, particle_y.array
+    return [(times, x[:, i], y[:, i]) for i in range(len(case.input.particles))]
@@ -1,14 +1,10 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import pyarrow as pa
-import pyarrow.compute as pc
-import pyarrow.parquet as pq
 from pytask import mark
 
 from dissertation.config import image_produces, in_build_dir
-from dissertation.sim.packings.cases import CASES, THIS_DIR, Case
-from dissertation.sim.two_particle.task_plot_shrinkage import distance
+from dissertation.sim.metrics import extract
+from dissertation.sim.packings.cases import CASES, THIS_DIR
 
 TIME_MIN = 1e-6
 SHRINKAGE_MIN = 1e-3
@@ -17,11 +13,9 @@ SHRINKAGE_MIN = 1e-3
 @mark.plot
 def task_plot_shrinkage_packings(
     produces=image_produces(in_build_dir(THIS_DIR) / "shrinkage"),
-    results_files={c.key: c.dir / "output.parquet" for c in CASES},
+    summary_files={c.key: c.dir / "summary.parquet" for c in CASES},
     cases={c.key: c for c in CASES},
 ):
-    data_frames = ((k, pq.read_table(f).flatten().flatten()) for k, f in results_files.items())
-
     fig = plt.figure(dpi=600)
     ax = fig.subplots()
     ax.set_xscale("log")
@@ -30,9 +24,9 @@ def task_plot_shrinkage_packings(
     max_time = TIME_MIN
     max_shrinkage = SHRINKAGE_MIN
 
-    for key, df in data_frames:
+    for key, f in summary_files.items():
         case = cases[key]
-        times, values = get_shrinkages(case, df)
+        times, values = extract(f, case.metric_spec, ["shrinkage"])["shrinkage"]
         ax.plot(times, values, **case.line_style, label=case.display)
         max_time = max(max_time, np.max(times))
         max_shrinkage = max(max_shrinkage, np.max(values))
@@ -47,43 +41,3 @@ def task_plot_shrinkage_packings(
         fig.savefig(p)
 
     plt.close(fig)
-
-
-def shoelace(x: np.ndarray, y: np.ndarray):
-    x_diffs = x - np.roll(x, -1)
-    y_sums = y + np.roll(y, -1)
-    return np.sum(x_diffs * y_sums) / 2
-
-
-def get_shrinkages(case: Case, df: pa.Table):
-    particles: list[pd.DataFrame] = [
-        (
-            df.filter(pc.field("Particle.Id") == p.id.bytes)
-            .group_by(["State.Id"])
-            .aggregate([("State.Time", "one"), ("Particle.Coordinates.X", "one"), ("Particle.Coordinates.Y", "one")])
-            .sort_by("State.Time_one")
-            .to_pandas()
-        )
-        for p in case.input.particles
-    ]
-    times = particles[0]["State.Time_one"].to_numpy()
-    mask = np.diff(times, prepend=[0]) > 0
-    times = times[mask] / case.input.time_norm_surface
-
-    if len(particles) > 2:
-        x = np.array([p["Particle.Coordinates.X_one"].to_numpy() for p in particles]).T
-        y = np.array([p["Particle.Coordinates.Y_one"].to_numpy() for p in particles]).T
-        volumes = np.array([shoelace(x_, y_) for x_, y_ in zip(x, y, strict=False)])
-        sqrt_volume0 = np.sqrt(volumes[0])
-        shrinkages = (sqrt_volume0 - np.sqrt(volumes[mask])) / sqrt_volume0
-    else:
-        distances = distance(
-            particles[0]["Particle.Coordinates.X_one"].to_numpy(),
-            particles[0]["Particle.Coordinates.Y_one"].to_numpy(),
-            particles[1]["Particle.Coordinates.X_one"].to_numpy(),
-            particles[1]["Particle.Coordinates.Y_one"].to_numpy(),
-        )
-        distance0 = distances[0]
-        shrinkages = (distance0 - distances[mask]) / distance0
-
-    return times, shrinkages
@@ -1,11 +1,14 @@
-import subprocess
-import time
 from pathlib import Path
 
 from pytask import mark, task
-from rich.markup import escape
 
+from dissertation.sim.output import write_flat_cache
 from dissertation.sim.packings.cases import CASES
+from dissertation.sim.projects import executable
+from dissertation.sim.scheduling import estimate_cost, estimate_memory
+from dissertation.sim.state_index import build_state_index, index_file, write_state_index
+from dissertation.sim.summary import write_summary
+from dissertation.sim.worker import run_simulation
 
 THIS_DIR = Path(__file__).parent
 
@@ -24,35 +27,34 @@ for case in CASES:
 
     @task(id=case.key)
     @mark.persist
-    @mark.sim
+    @mark.sim(cost=estimate_cost(case.input), memory=estimate_memory(case.input))
     def task_packings_run(
         input_file=case.dir / "input.json",
         produces={"output": case.dir / "output.parquet", "time": case.dir / "time.txt"},
-        csharp_proj=THIS_DIR / "packings.csproj",
+        solver=executable("packings"),
+    ):
+        run_simulation(solver, input_file, produces)
+
+    @task(id=case.key)
+    @mark.sim
+    def task_packings_summarize(
+        results_file=case.dir / "output.parquet",
+        produces=case.dir / "summary.parquet",
+    ):
+        write_summary(results_file, produces)
+
+    @task(id=case.key)
+    @mark.sim
+    def task_packings_cache_output(
+        results_file=case.dir / "output.parquet",
+        produces=case.dir / "output.arrow",
+    ):
+        write_flat_cache(results_file, produces)
+
+    @task(id=case.key)
+    @mark.sim
+    def task_packings_index_output(
+        results_file=case.dir / "output.arrow",
+        produces=index_file(case.dir / "output.arrow"),
     ):
-        start = time.time()
-        result = subprocess.run(
-            [
-                "dotnet",
-                "run",
-                "-c",
-                "Release",
-                "--project",
-                str(csharp_proj),
-                str(input_file),
-                str(produces["output"]),
-            ],
-            cwd=str(input_file.parent),
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-
-        end = time.time()
-
-        print("=== OUT ===\n", escape(result.stdout))
-        print("=== ERR ===\n", escape(result.stderr))
-
-        produces["time"].write_text(str(end - start))
-
-        result.check_returncode()
+        write_state_index(build_state_index(results_file), produces)
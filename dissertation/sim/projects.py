@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+from dissertation.config import in_build_dir
+
+THIS_DIR = Path(__file__).parent
+
+PROJECTS: dict[str, Path] = {
+    p.stem: p
+    for p in [
+        THIS_DIR / "two_particle" / "two_particle.csproj",
+        THIS_DIR / "packings" / "packings.csproj",
+        THIS_DIR / "randomized" / "randomized.csproj",
+    ]
+}
+
+
+def publish_dir(project: str) -> Path:
+    return in_build_dir(THIS_DIR / "bin") / project
+
+
+def executable(project: str) -> Path:
+    return publish_dir(project) / (project + (".exe" if sys.platform == "win32" else ""))
+
+
+def sources(project: str) -> list[Path]:
+    project_dir = PROJECTS[project].parent
+    return [project_dir / "Program.cs", project_dir / "Input.cs", THIS_DIR / "Worker.cs"]
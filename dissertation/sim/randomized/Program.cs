@@ -20,134 +20,146 @@ using RefraSin.TEPSolver.BreakConditions;
 using Serilog;
 using Serilog.Formatting.Display;
 
-Log.Logger = new LoggerConfiguration()
-    .MinimumLevel.Information()
-    .WriteTo.File("run.log")
-    .WriteTo.Console()
-    .CreateLogger();
-
-const string inputFile = "input.json";
-const string outputFile = "output.parquet";
-
-var inputText = File.ReadAllText(inputFile, encoding: Encoding.UTF8);
-
-var input =
-    JsonSerializer.Deserialize<Input>(
-        inputText,
-        new JsonSerializerOptions { PropertyNamingPolicy = JsonNamingPolicy.SnakeCaseLower }
-    ) ?? throw new ArgumentNullException("input");
-
-var materials = input
-    .Particles.Select(p => new ParticleMaterial(
-        p.Id,
-        "material",
-        SubstanceProperties.FromDensityAndMolarMass(p.Material.Density, p.Material.MolarMass),
-        new InterfaceProperties(p.Material.Surface.DiffusionCoefficient, p.Material.Surface.Energy),
-        p.GrainBoundaries.Select(kvp => new KeyValuePair<Guid, IInterfaceProperties>(
-                kvp.Key,
-                new InterfaceProperties(kvp.Value.DiffusionCoefficient, kvp.Value.Energy / 2)
-            ))
-            .ToDictionary()
-    ))
-    .ToArray();
-
-var particles = input
-    .Particles.Select(p =>
-        new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
+if (args is ["--worker"])
+{
+    SimulationWorker.Serve(Simulate);
+}
+else
+{
+    var inputFile = args.Length > 0 ? args[0] : "input.json";
+    var outputFile = args.Length > 1 ? args[1] : "output.parquet";
+    Simulate(File.ReadAllText(inputFile, encoding: Encoding.UTF8), outputFile);
+}
+
+void Simulate(string inputText, string outputFile)
+{
+    Log.Logger = new LoggerConfiguration()
+        .MinimumLevel.Information()
+        .WriteTo.File("run.log")
+        .WriteTo.Console()
+        .CreateLogger();
+
+    var input =
+        JsonSerializer.Deserialize<Input>(
+            inputText,
+            new JsonSerializerOptions { PropertyNamingPolicy = JsonNamingPolicy.SnakeCaseLower }
+        ) ?? throw new ArgumentNullException("input");
+
+    var materials = input
+        .Particles.Select(p => new ParticleMaterial(
             p.Id,
-            (p.X, p.Y),
-            p.RotationAngle,
-            p.NodeCount,
-            p.Radius,
-            p.Ovality,
-            p.PeakCount,
-            p.PeakHeight,
-            p.PeakShift
-        ).GetParticle(p.Id)
-    )
-    .ToArray();
+            "material",
+            SubstanceProperties.FromDensityAndMolarMass(p.Material.Density, p.Material.MolarMass),
+            new InterfaceProperties(
+                p.Material.Surface.DiffusionCoefficient,
+                p.Material.Surface.Energy
+            ),
+            p.GrainBoundaries.Select(kvp => new KeyValuePair<Guid, IInterfaceProperties>(
+                    kvp.Key,
+                    new InterfaceProperties(kvp.Value.DiffusionCoefficient, kvp.Value.Energy / 2)
+                ))
+                .ToDictionary()
+        ))
+        .ToArray();
+
+    var particles = input
+        .Particles.Select(p =>
+            new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
+                p.Id,
+                (p.X, p.Y),
+                p.RotationAngle,
+                p.NodeCount,
+                p.Radius,
+                p.Ovality,
+                p.PeakCount,
+                p.PeakHeight,
+                p.PeakShift
+            ).GetParticle(p.Id)
+        )
+        .ToArray();
+
+    var initialState = new SystemState(Guid.Empty, 0, particles);
+
+    ParticlePlot
+        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(initialState.Particles)
+        .SaveHtml("initialState.html");
+
+    var compactionStep = new OneByOneCompactionStep(
+        stepDistance: 2e-6,
+        minimumIntrusion: 1.5e-6,
+        maxStepCount: 10000
+    );
 
-var initialState = new SystemState(Guid.Empty, 0, particles);
+    var plotHandler = new PlotEventHandler();
 
-ParticlePlot
-    .PlotParticles<IParticle<IParticleNode>, IParticleNode>(initialState.Particles)
-    .SaveHtml("initialState.html");
+    // compactionStep.SystemStateReported += plotHandler.HandleReportSystemState;
 
-var compactionStep = new OneByOneCompactionStep(
-    stepDistance: 2e-6,
-    minimumIntrusion: 1.5e-6,
-    maxStepCount: 10000
-);
+    var compactedState = compactionStep.Solve(initialState);
 
-var plotHandler = new PlotEventHandler();
+    ParticlePlot
+        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(compactedState.Particles)
+        .SaveHtml("compactedState.html");
+
+    if (compactedState.Nodes.Where(n => n.Type is NodeType.GrainBoundary).Count() / 2 < 3)
+        throw new Exception("contact creation failed, too few grain boundaries present");
+
+    var solver = new SinteringSolver(
+        SolverRoutines.Default with
+        {
+            Remeshers =
+            [
+                new FreeSurfaceRemesher(deletionLimit: 0.15, neckProtectionCount: 10),
+                new NeckNeighborhoodRemesher(),
+                new LastSurfaceNodeRemesher(),
+            ],
+            BreakConditions =
+            [
+                new PoreClosedCondition(20e-6 / input.Particles[0].Radius),
+                new SolutionStuckBreakCondition(1e-4),
+            ],
+        },
+        remeshingEverySteps: 50
+    );
+
+    var remeshedState = new SystemState(
+        Guid.NewGuid(),
+        compactedState.Time,
+        solver.Routines.Remeshers.Aggregate<
+            IParticleSystemRemesher,
+            IParticleSystem<IParticle<IParticleNode>, IParticleNode>
+        >(compactedState, (state, remesher) => remesher.RemeshSystem(state))
+    );
 
-// compactionStep.SystemStateReported += plotHandler.HandleReportSystemState;
+    ParticlePlot
+        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(remeshedState.Particles)
+        .SaveHtml("remeshedState.html");
 
-var compactedState = compactionStep.Solve(initialState);
+    plotHandler = new PlotEventHandler();
+    solver.SessionInitialized += plotHandler.HandleSessionInitialized;
 
-ParticlePlot
-    .PlotParticles<IParticle<IParticleNode>, IParticleNode>(compactedState.Particles)
-    .SaveHtml("compactedState.html");
+    var process = new SinteringStep(
+        input.Duration,
+        input.Temperature,
+        solver,
+        materials,
+        input.GasConstant
+    );
 
-if (compactedState.Nodes.Where(n => n.Type is NodeType.GrainBoundary).Count() / 2 < 3)
-    throw new Exception("contact creation failed, too few grain boundaries present");
+    var storage = new ParquetStorage(outputFile);
+    process.UseStorage(storage);
 
-var solver = new SinteringSolver(
-    SolverRoutines.Default with
+    try
     {
-        Remeshers =
-        [
-            new FreeSurfaceRemesher(deletionLimit: 0.15, neckProtectionCount: 10),
-            new NeckNeighborhoodRemesher(),
-            new LastSurfaceNodeRemesher(),
-        ],
-        BreakConditions =
-        [
-            new PoreClosedCondition(20e-6 / input.Particles[0].Radius),
-            new SolutionStuckBreakCondition(1e-4),
-        ],
-    },
-    remeshingEverySteps: 50
-);
-
-var remeshedState = new SystemState(
-    Guid.NewGuid(),
-    compactedState.Time,
-    solver.Routines.Remeshers.Aggregate<
-        IParticleSystemRemesher,
-        IParticleSystem<IParticle<IParticleNode>, IParticleNode>
-    >(compactedState, (state, remesher) => remesher.RemeshSystem(state))
-);
-
-ParticlePlot
-    .PlotParticles<IParticle<IParticleNode>, IParticleNode>(remeshedState.Particles)
-    .SaveHtml("remeshedState.html");
-
-plotHandler = new PlotEventHandler();
-solver.SessionInitialized += plotHandler.HandleSessionInitialized;
-
-var process = new SinteringStep(
-    input.Duration,
-    input.Temperature,
-    solver,
-    materials,
-    input.GasConstant
-);
-
-var storage = new ParquetStorage(outputFile);
-process.UseStorage(storage);
-
-try
-{
-    var finalState = process.Solve(remeshedState);
-    ParticlePlot
-        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(finalState.Particles)
-        .SaveHtml("finalState.html");
-}
-finally
-{
-    storage.Dispose();
-    Log.CloseAndFlush();
+        var finalState = process.Solve(remeshedState);
+        ParticlePlot
+            .PlotParticles<IParticle<IParticleNode>, IParticleNode>(finalState.Particles)
+            .SaveHtml("finalState.html");
+    }
+    finally
+    {
+        storage.Dispose();
+        Log.CloseAndFlush();
+    }
 }
 
 class PlotEventHandler
@@ -0,0 +1,106 @@
+import argparse
+import json
+import subprocess
+import sys
+from collections.abc import Sequence
+
+import numpy as np
+
+from dissertation.config import ROOT_DIR
+from dissertation.sim.metrics import extract
+from dissertation.sim.randomized.cases import BATCH_SIZE, CAMPAIGN_FILE, CASES, SAMPLE_COUNT, Case, load_campaign
+from dissertation.sim.randomized.curves import CUTS, RaggedCurves
+from dissertation.sim.randomized.helper import metric_spec, successful_samples
+from dissertation.sim.randomized.statistics import EnsembleStatistics
+
+WAVE_SIZE = 5 * BATCH_SIZE
+METRICS = ["neck_size", "shrinkage"]
+
+
+def ensemble_statistics(case: Case, count: int, metrics: Sequence[str], times: Sequence[float]) -> EnsembleStatistics:
+    """statistics of the metrics at the given normalized times over the successful samples among the first ``count``"""
+    reports = [case.batch_report(b) for b, _ in enumerate(case.batches(count))]
+    statistics = EnsembleStatistics((len(metrics) * len(times),))
+
+    for i in successful_samples([r for r in reports if r.exists()], count):
+        curves = extract(case.batch_summary(i // BATCH_SIZE), metric_spec(case.sample(i)), metrics, sample=i)
+        statistics.update(np.concatenate([RaggedCurves.from_dict({i: curves[m]}).resample(times)[0] for m in metrics]))
+
+    return statistics
+
+
+def run_wave(case: Case) -> bool:
+    """build the simulation tasks of a case with the sample count currently recorded in the campaign file"""
+    # the solver is published by a task outside the randomized family, which the case expression would deselect
+    expression = f"(randomized and {case.key}) or (publish_simulation and randomized)"
+    command = [sys.executable, "-m", "pytask", "-m", "sim", "-k", expression]
+    return subprocess.run(command, cwd=ROOT_DIR.parent).returncode == 0
+
+
+def run_campaign(
+    case: Case,
+    metrics: Sequence[str],
+    times: Sequence[float],
+    tolerance: float,
+    wave_size: int = WAVE_SIZE,
+    max_count: int = SAMPLE_COUNT,
+    dry_run: bool = False,
+) -> int:
+    """Launch samples of a case in waves until the confidence intervals of the metric means are tight enough.
+
+    After each wave the relative half widths of the confidence intervals of the means at all given times are
+    checked against ``tolerance``. The reached sample count is recorded in the campaign file, which determines the
+    sample count of the case in later builds, so the campaign can be resumed and the plots follow it.
+    """
+    # whole batches only, as the simulation tasks of an existing batch are not rerun for added samples
+    wave_size = -(-wave_size // BATCH_SIZE) * BATCH_SIZE
+    campaign = load_campaign()
+    count = case.sample_count if dry_run else campaign.get(case.key, min(wave_size, max_count))
+
+    while True:
+        campaign[case.key] = count
+        if not dry_run:
+            CAMPAIGN_FILE.write_text(json.dumps(campaign, indent=4) + "\n")
+            if not run_wave(case):
+                print(f"{case.key}: build of {count} samples failed, stopping")
+                return count
+
+        statistics = ensemble_statistics(case, count, metrics, times)
+        message = f"{case.key}: {count} samples, {statistics.count} successful"
+        if statistics.count > 1:
+            relative_error = np.max(statistics.moments.standard_error / np.abs(statistics.moments.mean))
+            relative_half_width = np.max(statistics.relative_half_width())
+            message += (
+                f", relative standard error {relative_error:.2%}, confidence half width {relative_half_width:.2%}"
+            )
+        print(message)
+
+        if statistics.converged(tolerance) or count >= max_count or dry_run:
+            return count
+        count = min(count + wave_size, max_count)
+
+
+def main(argv: Sequence[str] | None = None):
+    cases = {c.key: c for c in CASES}
+
+    parser = argparse.ArgumentParser(description="Run the randomized cases in waves until the metric means converge.")
+    parser.add_argument("cases", nargs="*", default=list(cases), help="keys of the cases to run")
+    parser.add_argument("-m", "--metrics", nargs="+", choices=METRICS, default=METRICS, help="monitored metrics")
+    parser.add_argument("-t", "--times", nargs="+", type=float, default=CUTS, help="monitored normalized times")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="target relative confidence half width")
+    parser.add_argument(
+        "-w", "--wave-size", type=int, default=WAVE_SIZE, help="samples added per wave, rounded up to whole batches"
+    )
+    parser.add_argument("-n", "--max-count", type=int, default=SAMPLE_COUNT, help="maximum sample count")
+    parser.add_argument("--dry-run", action="store_true", help="only report the statistics of the current samples")
+    args = parser.parse_args(argv)
+
+    for key in args.cases:
+        count = run_campaign(
+            cases[key], args.metrics, args.times, args.tolerance, args.wave_size, args.max_count, args.dry_run
+        )
+        print(f"{key}: stopped at {count} samples")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
+import json
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, ClassVar
 from uuid import uuid5
 
 import numpy as np
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from scipy.stats import Mixture, Uniform, beta, make_distribution, weibull_min
 
 from dissertation.config import in_build_dir
@@ -18,7 +20,11 @@ from dissertation.sim.randomized.input import (
 )
 
 THIS_DIR = Path(__file__).parent
+CAMPAIGN_FILE = THIS_DIR / "campaign.json"
 SAMPLE_COUNT = 500
+SEED = 42
+PARAMETER_BLOCK_SIZE = 100
+BATCH_SIZE = 20
 PARTICLE_COUNT = 3
 NODE_COUNT = 200
 DISCRETIZATION_WIDTH = 2 * np.pi * REFERENCE_PARTICLE.radius / NODE_COUNT
@@ -50,25 +56,116 @@ class Categorical:
         return rng.choice(self.values, size=shape, p=self.probabilities)
 
 
+class Samples(Sequence[Input]):
+    """Read-only view of the samples of a case, which are only generated when accessed."""
+
+    def __init__(self, case: "Case"):
+        self._case = case
+
+    def __len__(self):
+        return self._case.sample_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._case.sample(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._case.sample(index)
+
+
 class Case(BaseModel):
     model_config = ConfigDict(frozen=True)
 
     key: str
     display: str
-    samples: list[Input]
+    sample_count: int = SAMPLE_COUNT
+    seed: int = SEED
 
     LINE_STYLE: ClassVar[dict[str, Any]]
 
+    _parameters: dict[int, dict[str, np.ndarray]] = PrivateAttr(default_factory=dict)
+    _samples: dict[int, Input] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def draw_parameters(cls, shape: tuple[int, int], rng: np.random.Generator) -> dict[str, np.ndarray]:
+        """draw the randomized particle parameters of several samples at once
+
+        Returns arrays of the given shape (samples, particles) keyed by the name of the ``ParticleInput`` field.
+        """
+        return {}
+
+    @classmethod
+    def create_input(cls, sample: int, parameters: dict[str, np.ndarray]) -> Input:
+        radii = parameters["radius"]
+        distance = 2 * np.max(radii * parameters.get("ovality", 1) * (1 + parameters.get("peak_height", 0)))
+
+        particles = [
+            ParticleInput(
+                id=uuid5(NAMESPACE, f"{sample}/{i}"),
+                x=x,
+                y=y,
+                **{name: values[i] for name, values in parameters.items()},
+                material=REFERENCE_MATERIAL,
+                grain_boundaries={
+                    uuid5(NAMESPACE, f"{sample}/{j}"): REFERENCE_GRAIN_BOUNDARY for j in range(PARTICLE_COUNT) if j != i
+                },
+                node_count=np.ceil(2 * np.pi * radii[i] / DISCRETIZATION_WIDTH),
+            )
+            for i, (x, y) in zip(range(PARTICLE_COUNT), particle_coords(distance), strict=True)
+        ]
+
+        return Input(particles=particles)
+
+    def parameters(self, block: int) -> dict[str, np.ndarray]:
+        """parameters of the samples in a block of ``PARAMETER_BLOCK_SIZE``, drawn from a generator seeded by block
+
+        Drawing per block keeps each sample reproducible from the seed alone, independent of the sample count.
+        """
+        if block not in self._parameters:
+            rng = np.random.default_rng([self.seed, block])
+            self._parameters[block] = self.draw_parameters((PARAMETER_BLOCK_SIZE, PARTICLE_COUNT), rng)
+        return self._parameters[block]
+
+    def sample(self, sample: int) -> Input:
+        if sample not in self._samples:
+            block, row = divmod(sample, PARAMETER_BLOCK_SIZE)
+            parameters = {name: values[row] for name, values in self.parameters(block).items()}
+            self._samples[sample] = self.create_input(sample, parameters)
+        return self._samples[sample]
+
+    @property
+    def samples(self) -> Samples:
+        return Samples(self)
+
     def dir(self, sample: int | None = None) -> Path:
         path = in_build_dir(THIS_DIR / "cases") / self.key
         return path if sample is None else path / str(sample)
 
+    def batches(self, count: int | None = None) -> list[range]:
+        """sample index ranges of the batches needed to cover the first ``count`` samples"""
+        count = self.sample_count if count is None else count
+        return [range(start, min(start + BATCH_SIZE, count)) for start in range(0, count, BATCH_SIZE)]
+
+    def batch_report(self, batch: int) -> Path:
+        return self.dir() / "batches" / f"{batch:03}.json"
+
+    def batch_summary(self, batch: int) -> Path:
+        return self.dir() / "summaries" / f"{batch:03}.parquet"
+
+    def curves(self, metric: str) -> Path:
+        return self.dir() / "curves" / f"{metric}.parquet"
+
+    def manifest(self) -> Path:
+        return self.dir() / "manifest.parquet"
+
 
 class NominalCase(Case):
     LINE_STYLE = dict(color="black")
 
     @classmethod
-    def create_input(cls, sample: int):
+    def create_input(cls, sample: int, parameters: dict[str, np.ndarray]) -> Input:
         particles = [
             ParticleInput(
                 id=uuid5(NAMESPACE, f"{sample}/{i}"),
@@ -91,77 +188,40 @@ class NominalCase(Case):
 
     @property
     def input(self):
-        return self.samples[0]
+        return self.sample(0)
 
 
-NOMINAL = NominalCase(
-    key="nominal",
-    display="Nominal",
-    samples=[NominalCase.create_input(0)],
-)
+NOMINAL = NominalCase(key="nominal", display="Nominal", sample_count=1)
+
+
+def draw_radii(dist, shape: tuple[int, int], rng: np.random.Generator) -> np.ndarray:
+    """particle radii in m from a size distribution in µm, sorted descending within each sample"""
+    return np.sort(dist.sample(shape, rng=rng) / 1e6, axis=-1)[..., ::-1]
 
 
 class CircularCase(Case):
     PARTICLE_SIZE_DIST: ClassVar = Weibull2(1.819, 1281.114, 6.858, 1671.525, 0.413)
-    RNG: ClassVar = np.random.default_rng(42)
 
     LINE_STYLE = dict(color="C0")
 
     @classmethod
-    def create_input(cls, sample: int):
-        radii = np.sort(cls.PARTICLE_SIZE_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG) / 1e6)[::-1]
-        distance = 2 * np.max(radii)
-
-        particles = [
-            ParticleInput(
-                id=uuid5(NAMESPACE, f"{sample}/{i}"),
-                x=x,
-                y=y,
-                radius=radii[i],
-                material=REFERENCE_MATERIAL,
-                grain_boundaries={
-                    uuid5(NAMESPACE, f"{sample}/{j}"): REFERENCE_GRAIN_BOUNDARY for j in range(PARTICLE_COUNT) if j != i
-                },
-                node_count=np.ceil(2 * np.pi * radii[i] / DISCRETIZATION_WIDTH),
-            )
-            for i, (x, y) in zip(range(PARTICLE_COUNT), particle_coords(distance), strict=True)
-        ]
-
-        return Input(particles=particles)
+    def draw_parameters(cls, shape: tuple[int, int], rng: np.random.Generator) -> dict[str, np.ndarray]:
+        return dict(radius=draw_radii(cls.PARTICLE_SIZE_DIST, shape, rng))
 
 
 class OvalCase(Case):
     PARTICLE_SIZE_DIST: ClassVar = Weibull2(5.227, 1641.123, 5.193, 568.826, 0.854)
     OVALITY_DIST: ClassVar = Weibull(1.325, 0.377, 1)
-    RNG: ClassVar = np.random.default_rng(42)
 
     LINE_STYLE = dict(color="C0")
 
     @classmethod
-    def create_input(cls, sample: int):
-        radii = np.sort(cls.PARTICLE_SIZE_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG) / 1e6)[::-1]
-        ovalities = cls.OVALITY_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        rotations = ROTATION_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        distance = 2 * np.max(radii * ovalities)
-
-        particles = [
-            ParticleInput(
-                id=uuid5(NAMESPACE, f"{sample}/{i}"),
-                x=x,
-                y=y,
-                radius=radii[i],
-                ovality=ovalities[i],
-                rotation_angle=rotations[i],
-                material=REFERENCE_MATERIAL,
-                grain_boundaries={
-                    uuid5(NAMESPACE, f"{sample}/{j}"): REFERENCE_GRAIN_BOUNDARY for j in range(PARTICLE_COUNT) if j != i
-                },
-                node_count=np.ceil(2 * np.pi * radii[i] / DISCRETIZATION_WIDTH),
-            )
-            for i, (x, y) in zip(range(PARTICLE_COUNT), particle_coords(distance), strict=True)
-        ]
-
-        return Input(particles=particles)
+    def draw_parameters(cls, shape: tuple[int, int], rng: np.random.Generator) -> dict[str, np.ndarray]:
+        return dict(
+            radius=draw_radii(cls.PARTICLE_SIZE_DIST, shape, rng),
+            ovality=cls.OVALITY_DIST.sample(shape, rng=rng),
+            rotation_angle=ROTATION_DIST.sample(shape, rng=rng),
+        )
 
 
 class ShapeCase(Case):
@@ -170,59 +230,34 @@ class ShapeCase(Case):
     HEIGHT_DIST: ClassVar = Beta(a=3.938, b=43.030)
     SHIFT_DIST: ClassVar = Uniform(a=0, b=0.5)
     COUNT_DIST: ClassVar = Categorical(np.arange(3, 8 + 1), np.asarray([0.680, 0.179, 0.091, 0.032, 0.011, 0.007]))
-    RNG: ClassVar = np.random.default_rng(42)
 
     LINE_STYLE = dict(color="C0")
 
     @classmethod
-    def create_input(cls, sample: int):
-        radii = np.sort(cls.PARTICLE_SIZE_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG) / 1e6)[::-1]
-        ovalities = cls.OVALITY_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        rotations = ROTATION_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        heights = cls.HEIGHT_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        shifts = cls.SHIFT_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        counts = cls.COUNT_DIST.sample((PARTICLE_COUNT,), rng=cls.RNG)
-        distance = 2 * np.max(radii * ovalities * (1 + heights))
+    def draw_parameters(cls, shape: tuple[int, int], rng: np.random.Generator) -> dict[str, np.ndarray]:
+        return dict(
+            radius=draw_radii(cls.PARTICLE_SIZE_DIST, shape, rng),
+            ovality=cls.OVALITY_DIST.sample(shape, rng=rng),
+            rotation_angle=ROTATION_DIST.sample(shape, rng=rng),
+            peak_height=cls.HEIGHT_DIST.sample(shape, rng=rng),
+            peak_shift=cls.SHIFT_DIST.sample(shape, rng=rng),
+            peak_count=cls.COUNT_DIST.sample(shape, rng=rng),
+        )
 
-        particles = [
-            ParticleInput(
-                id=uuid5(NAMESPACE, f"{sample}/{i}"),
-                x=x,
-                y=y,
-                radius=radii[i],
-                ovality=ovalities[i],
-                peak_count=counts[i],
-                peak_height=heights[i],
-                peak_shift=shifts[i],
-                rotation_angle=rotations[i],
-                material=REFERENCE_MATERIAL,
-                grain_boundaries={
-                    uuid5(NAMESPACE, f"{sample}/{j}"): REFERENCE_GRAIN_BOUNDARY for j in range(PARTICLE_COUNT) if j != i
-                },
-                node_count=np.ceil(2 * np.pi * radii[i] / DISCRETIZATION_WIDTH),
-            )
-            for i, (x, y) in zip(range(PARTICLE_COUNT), particle_coords(distance), strict=True)
-        ]
 
-        return Input(particles=particles)
+def load_campaign() -> dict[str, int]:
+    """sample counts per case key at which the early-stopping campaign reached the target precision"""
+    if not CAMPAIGN_FILE.exists():
+        return {}
+    return json.loads(CAMPAIGN_FILE.read_text())
+
 
+CAMPAIGN = load_campaign()
 
 CASES = [
-    CircularCase(
-        key="circular",
-        display="Circular",
-        samples=[CircularCase.create_input(i) for i in range(SAMPLE_COUNT)],
-    ),
-    OvalCase(
-        key="oval",
-        display="Oval",
-        samples=[OvalCase.create_input(i) for i in range(SAMPLE_COUNT)],
-    ),
-    ShapeCase(
-        key="shape",
-        display="Shape",
-        samples=[ShapeCase.create_input(i) for i in range(SAMPLE_COUNT)],
-    ),
+    CircularCase(key="circular", display="Circular", sample_count=CAMPAIGN.get("circular", SAMPLE_COUNT)),
+    OvalCase(key="oval", display="Oval", sample_count=CAMPAIGN.get("oval", SAMPLE_COUNT)),
+    ShapeCase(key="shape", display="Shape", sample_count=CAMPAIGN.get("shape", SAMPLE_COUNT)),
 ]
 
 MEAN_LINE_STYLE: dict[str, Any] = dict(color="C3")
@@ -0,0 +1,104 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+CUTS = [1e-6, 1e-4]
+MEAN_SUPPORTS = np.geomspace(1e-7, 1e-3, 100)
+
+
+@dataclass(frozen=True)
+class RaggedCurves:
+    """Curves of several samples packed into flat arrays.
+
+    The curve of ``samples[k]`` spans ``offsets[k]:offsets[k + 1]`` of ``times`` and ``values``, with strictly
+    increasing times per curve.
+    """
+
+    samples: np.ndarray
+    offsets: np.ndarray
+    times: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_dict(cls, curves: dict[int, tuple[np.ndarray, np.ndarray]]) -> "RaggedCurves":
+        samples = np.array(sorted(curves), dtype=int)
+        lengths = [len(curves[i][0]) for i in samples]
+        return cls(
+            samples=samples,
+            offsets=np.concatenate([[0], np.cumsum(lengths, dtype=int)]),
+            times=np.concatenate([curves[i][0] for i in samples]) if len(samples) else np.empty(0),
+            values=np.concatenate([curves[i][1] for i in samples]) if len(samples) else np.empty(0),
+        )
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def items(self) -> Iterator[tuple[int, tuple[np.ndarray, np.ndarray]]]:
+        for k, i in enumerate(self.samples):
+            span = slice(self.offsets[k], self.offsets[k + 1])
+            yield int(i), (self.times[span], self.values[span])
+
+    def resample(self, grid: np.ndarray) -> np.ndarray:
+        """Linearly interpolate all curves at the given times in one vectorized operation.
+
+        Returns a samples × times matrix, holding the first or last value of a curve outside its time range as
+        ``np.interp`` does and NaN for empty curves. Both the curve times and the grid are mapped to their rank among
+        all occurring times and offset per sample, so that a single ``searchsorted`` over the packed times locates
+        the enclosing interval of every grid point in every curve.
+        """
+        grid = np.asarray(grid, dtype=float)
+        count = len(self)
+        if len(self.times) == 0:
+            return np.full((count, len(grid)), np.nan)
+
+        starts, ends = self.offsets[:-1, None], self.offsets[1:, None]
+        empty = ends == starts
+
+        levels = np.unique(np.concatenate([self.times, grid]))
+        sample_index = np.repeat(np.arange(count), np.diff(self.offsets))
+        keys = sample_index * len(levels) + np.searchsorted(levels, self.times)
+        queries = np.arange(count)[:, None] * len(levels) + np.searchsorted(levels, grid)[None, :]
+
+        # first point after the grid point, kept inside the curve; single point curves end up at that point
+        upper = np.clip(np.searchsorted(keys, queries, side="right"), starts + 1, ends - 1)
+        upper = np.where(empty, 0, upper)
+        lower = np.where(empty, 0, np.maximum(upper - 1, starts))
+
+        t0, t1 = self.times[lower], self.times[upper]
+        v0, v1 = self.values[lower], self.values[upper]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(t1 > t0, np.clip((grid - t0) / (t1 - t0), 0, 1), 0)
+        resampled = v0 + weights * (v1 - v0)
+        return np.where(empty, np.nan, resampled)
+
+
+def write_curves(file: Path, curves: RaggedCurves):
+    """store the extracted curves of all samples of a case in one table ordered by sample"""
+    file.parent.mkdir(exist_ok=True, parents=True)
+    pq.write_table(
+        pa.table(
+            {
+                "Sample": pa.array(np.repeat(curves.samples, np.diff(curves.offsets)), pa.int32()),
+                "Time": curves.times,
+                "Value": curves.values,
+            }
+        ),
+        file,
+    )
+
+
+def read_curves(file: Path, count: int | None = None) -> RaggedCurves:
+    """curves of the samples among the first ``count`` from a curve store"""
+    table = pq.read_table(file, filters=None if count is None else pc.field("Sample") < count)
+    samples, starts = np.unique(table["Sample"].to_numpy(), return_index=True)
+    return RaggedCurves(
+        samples=samples,
+        offsets=np.append(starts, table.num_rows),
+        times=table["Time"].to_numpy(),
+        values=table["Value"].to_numpy(),
+    )
@@ -0,0 +1,75 @@
+import argparse
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from dissertation.sim.randomized.cases import CASES, Case
+
+
+class EnsembleReport(BaseModel):
+    available: list[int] = []
+    missing: list[int] = []
+    corrupt: dict[int, str] = {}
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.available)} available, {len(self.missing)} missing [{_ranges(self.missing)}], "
+            f"{len(self.corrupt)} corrupt [{_ranges(self.corrupt)}]"
+        )
+
+
+def _ranges(samples: Iterable[int]) -> str:
+    """compact display of sample indices, e.g. ``2, 5-9``"""
+    spans: list[list[int]] = []
+    for i in sorted(samples):
+        if spans and i == spans[-1][1] + 1:
+            spans[-1][1] = i
+        else:
+            spans.append([i, i])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in spans)
+
+
+def output_file(case: Case, sample: int) -> Path:
+    return case.dir(sample) / "output.parquet"
+
+
+def check_outputs(case: Case, samples: Iterable[int] | None = None) -> EnsembleReport:
+    """Classify the sample outputs of a case as available, missing or corrupt by reading only their footers."""
+    report = EnsembleReport()
+
+    for i in range(case.sample_count) if samples is None else samples:
+        file = output_file(case, i)
+        if not file.exists():
+            report.missing.append(i)
+            continue
+
+        try:
+            pq.read_metadata(file)
+        except (OSError, pa.ArrowException) as e:
+            report.corrupt[i] = str(e)
+            continue
+
+        report.available.append(i)
+
+    return report
+
+
+def main(argv: Sequence[str] | None = None):
+    cases = {c.key: c for c in CASES}
+
+    parser = argparse.ArgumentParser(description="Report missing and corrupt sample outputs of the randomized cases.")
+    parser.add_argument("cases", nargs="*", default=list(cases), help="keys of the cases to check")
+    args = parser.parse_args(argv)
+
+    for key in args.cases:
+        report = check_outputs(cases[key])
+        print(f"{key}: {report}")
+        for i, error in sorted(report.corrupt.items()):
+            print(f"    {i}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
-import pyarrow as pa
-import pyarrow.parquet as pq
+import json
+from pathlib import Path
 
+from dissertation.sim.metrics import MetricSpec
+from dissertation.sim.randomized.input import REFERENCE_PARTICLE, TIME_NORM_SURFACE, Input
 
-def read_parquet_output_files(file_names):
-    for f in file_names:
-        try:
-            table = pq.read_table(f)
-        except pa.ArrowInvalid:
-            print(f"Reading of file {f} failed. Skipping it.")
-            continue
 
-        yield int(f.parent.name), table.flatten().flatten()
+def successful_samples(report_files: list[Path], count: int | None = None) -> list[int]:
+    """indices of the samples reported as successful by the given batch reports, limited to the first ``count``"""
+    samples = [
+        entry["sample"]
+        for f in report_files
+        for entry in json.loads(f.read_text())
+        if entry["success"] and (count is None or entry["sample"] < count)
+    ]
+    return sorted(samples)
+
+
+def metric_spec(input: Input) -> MetricSpec:
+    return MetricSpec(
+        time_norm=TIME_NORM_SURFACE,
+        radius=REFERENCE_PARTICLE.radius,
+        particles=tuple(p.id.bytes for p in input.particles),
+    )
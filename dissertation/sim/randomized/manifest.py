@@ -0,0 +1,99 @@
+from collections.abc import Iterable
+from pathlib import Path
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dissertation.sim.randomized.cases import SAMPLE_COUNT, Case
+from dissertation.sim.randomized.input import REFERENCE_GRAIN_BOUNDARY, REFERENCE_MATERIAL, Input, ParticleInput
+
+SCHEMA = pa.schema(
+    [
+        ("Sample", pa.int32()),
+        ("Particle", pa.int8()),
+        ("Id", pa.string()),
+        ("X", pa.float64()),
+        ("Y", pa.float64()),
+        ("RotationAngle", pa.float64()),
+        ("Radius", pa.float64()),
+        ("Ovality", pa.float64()),
+        ("PeakCount", pa.int32()),
+        ("PeakHeight", pa.float64()),
+        ("PeakShift", pa.float64()),
+        ("NodeCount", pa.int32()),
+    ]
+)
+FIELDS = dict(
+    X="x",
+    Y="y",
+    RotationAngle="rotation_angle",
+    Radius="radius",
+    Ovality="ovality",
+    PeakCount="peak_count",
+    PeakHeight="peak_height",
+    PeakShift="peak_shift",
+    NodeCount="node_count",
+)
+
+
+def manifest_table(case: Case, count: int | None = None) -> pa.Table:
+    """parameters of the first ``count`` samples of a case as table with one row per particle"""
+    count = case.sample_count if count is None else count
+    columns = {name: [] for name in SCHEMA.names}
+
+    for s in range(count):
+        for p, particle in enumerate(case.sample(s).particles):
+            columns["Sample"].append(s)
+            columns["Particle"].append(p)
+            columns["Id"].append(str(particle.id))
+            for column, field in FIELDS.items():
+                columns[column].append(getattr(particle, field))
+
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def write_manifest(case: Case, file: Path):
+    # always cover the full sample count, so that the manifest stays valid while a campaign extends the case
+    table = manifest_table(case, max(case.sample_count, SAMPLE_COUNT))
+    file.parent.mkdir(exist_ok=True, parents=True)
+    pq.write_table(table.sort_by([("Sample", "ascending"), ("Particle", "ascending")]), file)
+
+
+def read_samples(file: Path, samples: Iterable[int]) -> dict[int, Input]:
+    """input models of the given samples, only reading their rows from the manifest"""
+    samples = list(samples)
+    table = pq.read_table(file, filters=pc.field("Sample").isin(samples)).sort_by(
+        [("Sample", "ascending"), ("Particle", "ascending")]
+    )
+
+    rows: dict[int, list[dict]] = {s: [] for s in samples}
+    for row in table.to_pylist():
+        rows[row["Sample"]].append(row)
+
+    missing = [s for s, r in rows.items() if not r]
+    if missing:
+        raise KeyError(
+            f"Samples {missing} not found in manifest {file}, it must be rebuilt for the current sample count."
+        )
+
+    return {s: sample_input(rows[s]) for s in samples}
+
+
+def sample_input(rows: list[dict]) -> Input:
+    if not rows:
+        raise KeyError("Sample not found in manifest.")
+
+    ids = [UUID(r["Id"]) for r in rows]
+    particles = [
+        ParticleInput(
+            id=id,
+            **{field: r[column] for column, field in FIELDS.items()},
+            material=REFERENCE_MATERIAL,
+            grain_boundaries={other: REFERENCE_GRAIN_BOUNDARY for other in ids if other != id},
+        )
+        for id, r in zip(ids, rows, strict=True)
+    ]
+
+    return Input(particles=particles)
@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.stats import t as student_t
+
+CONFIDENCE_LEVEL = 0.95
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+@dataclass
+class Welford:
+    """Running mean and variance of a vector quantity, updated one sample at a time in a numerically stable way."""
+
+    shape: tuple[int, ...]
+    count: int = 0
+    mean: np.ndarray = field(init=False)
+    m2: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+
+    def update(self, x: np.ndarray):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """unbiased sample variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.full(self.shape, np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> np.ndarray:
+        """standard error of the mean"""
+        return self.std / np.sqrt(self.count)
+
+    def confidence_half_width(self, level: float = CONFIDENCE_LEVEL) -> np.ndarray:
+        """half width of the confidence interval of the mean, based on Student's t distribution"""
+        if self.count < 2:
+            return np.full(self.shape, np.inf)
+        return student_t.ppf((1 + level) / 2, self.count - 1) * self.standard_error
+
+
+@dataclass
+class P2Quantile:
+    """Streaming estimate of a quantile of a vector quantity by the P² algorithm (Jain & Chlamtac 1985).
+
+    Five markers per element track the minimum, the maximum, the quantile and two intermediate quantiles; their
+    heights are adjusted by piecewise parabolic interpolation, so that memory is constant in the sample count.
+    """
+
+    p: float
+    shape: tuple[int, ...]
+    count: int = 0
+    heights: np.ndarray = field(init=False)
+    positions: np.ndarray = field(init=False)
+    desired: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.heights = np.zeros((5, *self.shape))
+        self.positions = np.arange(1, 6, dtype=float).reshape(5, *([1] * len(self.shape))) * np.ones(self.shape)
+        self.desired = np.array([1, 1 + 2 * self.p, 1 + 4 * self.p, 3 + 2 * self.p, 5])
+
+    @property
+    def _increments(self) -> np.ndarray:
+        return np.array([0, self.p / 2, self.p, (1 + self.p) / 2, 1])
+
+    def update(self, x: np.ndarray):
+        x = np.broadcast_to(x, self.shape)
+
+        if self.count < 5:
+            self.heights[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                self.heights.sort(axis=0)
+            return
+
+        self.count += 1
+        q, n = self.heights, self.positions
+
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        cell = np.clip(np.sum(x >= q[1:4], axis=0), 0, 3)
+        n += np.arange(5).reshape(5, *([1] * len(self.shape))) > cell
+        self.desired = self.desired + self._increments
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            adjust = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            s = np.sign(d)
+
+            parabolic = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+            )
+            neighbour = np.where(s > 0, q[i + 1], q[i - 1])
+            neighbour_position = np.where(s > 0, n[i + 1], n[i - 1])
+            linear = q[i] + s * (neighbour - q[i]) / (neighbour_position - n[i])
+            estimate = np.where((q[i - 1] < parabolic) & (parabolic < q[i + 1]), parabolic, linear)
+
+            q[i] = np.where(adjust, estimate, q[i])
+            n[i] = np.where(adjust, n[i] + s, n[i])
+
+    @property
+    def value(self) -> np.ndarray:
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        if self.count < 5:
+            return np.quantile(self.heights[: self.count], self.p, axis=0)
+        return self.heights[2]
+
+
+@dataclass
+class EnsembleStatistics:
+    """Incremental mean, confidence interval and quantiles of sample values at fixed support points.
+
+    The history of the estimates after each update shows their convergence with the sample count.
+    """
+
+    shape: tuple[int, ...]
+    quantiles: tuple[float, ...] = QUANTILES
+    level: float = CONFIDENCE_LEVEL
+    moments: Welford = field(init=False)
+    sketches: list[P2Quantile] = field(init=False)
+    history: dict[str, list[np.ndarray]] = field(init=False)
+
+    def __post_init__(self):
+        self.moments = Welford(self.shape)
+        self.sketches = [P2Quantile(p, self.shape) for p in self.quantiles]
+        self.history = dict(mean=[], half_width=[], quantiles=[])
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def update(self, x: np.ndarray):
+        """add the values of a finished sample"""
+        self.moments.update(x)
+        for s in self.sketches:
+            s.update(x)
+
+        self.history["mean"].append(self.moments.mean.copy())
+        self.history["half_width"].append(self.moments.confidence_half_width(self.level))
+        self.history["quantiles"].append(np.array([s.value for s in self.sketches]))
+
+    def relative_half_width(self) -> np.ndarray:
+        return self.moments.confidence_half_width(self.level) / np.abs(self.moments.mean)
+
+    def converged(self, tolerance: float) -> bool:
+        """whether the confidence intervals of the mean are narrower than ``tolerance`` relative to the mean"""
+        return self.count > 1 and bool(np.all(self.relative_half_width() <= tolerance))
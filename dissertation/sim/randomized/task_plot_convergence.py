@@ -0,0 +1,72 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from pytask import mark, task
+
+from dissertation.config import DEFAULT_FIGSIZE, image_produces
+from dissertation.sim.randomized.cases import CASES, MEAN_LINE_STYLE
+from dissertation.sim.randomized.curves import CUTS, read_curves
+from dissertation.sim.randomized.statistics import EnsembleStatistics
+
+METRIC_LABELS = dict(
+    neck_size="Average Relative Neck Size $\\Radius_{\\Neck} / \\Radius_0$",
+    shrinkage="Shrinkage $\\Shrinkage$",
+)
+
+for case in CASES:
+    for metric, label in METRIC_LABELS.items():
+
+        @task(id=f"{case.key}/{metric}")
+        @mark.plot
+        def task_plot_convergence_randomized(
+            produces=image_produces(case.dir() / f"{metric}_convergence"),
+            curve_file=case.curves(metric),
+            label=label,
+        ):
+            values = read_curves(curve_file).resample(CUTS)
+
+            statistics = EnsembleStatistics((len(CUTS),))
+            for x in values:
+                statistics.update(x)
+
+            counts = np.arange(1, statistics.count + 1)
+            means = np.array(statistics.history["mean"])
+            half_widths = np.array(statistics.history["half_width"])
+            quantiles = np.array(statistics.history["quantiles"])
+
+            fig = plt.figure(figsize=tuple(DEFAULT_FIGSIZE * [1, 1.5]))
+            axs = fig.subplots(len(CUTS), 1, sharex=True)
+
+            for i, (t, ax) in enumerate(zip(CUTS, axs, strict=True)):
+                ax.set_title(f"$\\Time / \\TimeNorm_{{\\Surface}} = \\num[print-unity-mantissa=false]{{{t:.0e}}}$")
+                ax.set_xscale("log")
+                ax.grid(True, "both")
+
+                ax.fill_between(
+                    counts,
+                    means[:, i] - half_widths[:, i],
+                    means[:, i] + half_widths[:, i],
+                    **MEAN_LINE_STYLE,
+                    alpha=0.3,
+                    lw=0,
+                    label=f"\\qty{{{statistics.level * 100:.0f}}}{{\\percent}} Confidence Interval",
+                )
+                ax.plot(counts, means[:, i], **MEAN_LINE_STYLE, label="Mean of Samples")
+                for j, p in enumerate(statistics.quantiles):
+                    ax.plot(
+                        counts,
+                        quantiles[:, j, i],
+                        color="k",
+                        ls=":" if p != 0.5 else "--",
+                        lw=0.8,
+                        label=f"Quantiles {', '.join(f'{q:g}' for q in statistics.quantiles)}" if j == 0 else None,
+                    )
+
+                ax.set_ylabel(label)
+                ax.legend()
+
+            axs[-1].set_xlabel("Sample Count")
+
+            for p in produces:
+                fig.savefig(p)
+
+            plt.close(fig)
@@ -1,35 +1,40 @@
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import pyarrow as pa
-import pyarrow.compute as pc
-import pyarrow.parquet as pq
 from matplotlib.contour import ContourSet
 from matplotlib.ticker import LogLocator
 from pytask import mark, task
 
 from dissertation.config import image_produces
-from dissertation.sim.randomized.cases import CASES, Case
+from dissertation.sim.randomized.cases import BATCH_SIZE, CASES, Case
+from dissertation.sim.randomized.ensemble import output_file
+from dissertation.sim.randomized.helper import successful_samples
 from dissertation.sim.randomized.input import TIME_NORM_SURFACE, Input
+from dissertation.sim.state_index import index_file, load_state_index, read_particle_outlines
 
 for case in CASES:
-    for i, sample in enumerate(case.samples):
+    for i in range(case.sample_count):
 
         @task(id=f"{case.key}/{i}")
         @mark.plot
         def task_plot_evolution_randomized(
             case: Case = case,
-            sample: Input = sample,
-            results_file=case.dir(i) / "output.parquet",
+            sample_index=i,
+            batch_report=case.batch_report(i // BATCH_SIZE),
+            state_index=index_file(output_file(case, i)),
             produces=image_produces(case.dir(i) / "evolution"),
         ):
-            df = pq.read_table(results_file).flatten().flatten()
+            if sample_index not in successful_samples([batch_report]):
+                raise RuntimeError(f"Simulation of sample {sample_index} failed, see {batch_report}.")
+
+            sample = case.sample(sample_index)
 
             fig = plt.figure()
             ax = fig.subplots()
             ax.set_aspect("equal", adjustable="datalim")
 
-            particles = [get_states(df, sample, i) for i in range(len(sample.particles))]
+            particles = get_states(output_file(case, sample_index), state_index, sample)
             times = particles[0][0]
 
             times_to_plot = np.geomspace(1e-6, times[-1], 10)
@@ -68,18 +73,12 @@ for case in CASES:
 
             plt.close(fig)
 
-    def get_states(df: pa.Table, sample: Input, particle_index: int):
-        particle: pd.DataFrame = (
-            df.filter(pc.field("Particle.Id") == sample.particles[particle_index].id.bytes)
-            .group_by(["State.Id"])
-            .aggregate([("State.Time", "one"), ("Node.Coordinates.X", "list"), ("Node.Coordinates.Y", "list")])
-            .sort_by("State.Time_one")
-            .to_pandas()
-        )
+    def get_states(results_file: Path, state_index: Path, sample: Input):
+        index = load_state_index(state_index)
+        positions = np.flatnonzero(index.monotonic & (index.times > 1))
+        times, x, y = read_particle_outlines(results_file, [p.id.bytes for p in sample.particles], index, positions)
 
-        mask = (particle["State.Time_one"] > 1) & (np.diff(particle["State.Time_one"], prepend=[0]) > 0)
-        times = np.asarray(particle["State.Time_one"][mask] / TIME_NORM_SURFACE)
-        particle_x = np.asarray(particle["Node.Coordinates.X_list"] * 1e6)
-        particle_y = np.asarray(particle["Node.Coordinates.Y_list"] * 1e6)
+        times = times / TIME_NORM_SURFACE
+        x, y = x * 1e6, y * 1e6
 
-        return times, particle_x, particle_y
+        return [(times, x[:, i], y[:, i]) for i in range(len(sample.particles))]
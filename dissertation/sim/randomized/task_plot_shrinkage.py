@@ -1,36 +1,47 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import pyarrow as pa
-import pyarrow.compute as pc
-import pyarrow.parquet as pq
 from matplotlib.gridspec import GridSpec
 from pytask import mark, task
 
 from dissertation.config import DEFAULT_FIGSIZE, image_produces
-from dissertation.sim.randomized.cases import CASES, MEAN_LINE_STYLE, NOMINAL, SAMPLE_COUNT
-from dissertation.sim.randomized.helper import read_parquet_output_files
-from dissertation.sim.randomized.input import TIME_NORM_SURFACE, Input
-from dissertation.sim.two_particle.task_plot_shrinkage import distance
+from dissertation.sim.metrics import extract
+from dissertation.sim.randomized.cases import BATCH_SIZE, CASES, MEAN_LINE_STYLE, NOMINAL
+from dissertation.sim.randomized.curves import CUTS, MEAN_SUPPORTS, RaggedCurves, read_curves, write_curves
+from dissertation.sim.randomized.helper import metric_spec, successful_samples
 
 SHRINKAGE_LIMITS = (1e-3, 2e-1)
-CUTS = [1e-6, 1e-4]
 CUT_COLORS = ["C2", "C4"]
 
 for case in CASES:
-    for frame, count in enumerate([SAMPLE_COUNT] + list(np.unique(np.geomspace(1, SAMPLE_COUNT, 50, dtype=int)))):
+
+    @task(id=case.key)
+    @mark.plot
+    def task_extract_shrinkage_randomized(
+        batch_reports=[case.batch_report(b) for b, _ in enumerate(case.batches())],
+        batch_summaries=[case.batch_summary(b) for b, _ in enumerate(case.batches())],
+        case=case,
+        produces=case.curves("shrinkage"),
+    ):
+        curves = {}
+        for i in successful_samples(batch_reports):
+            spec = metric_spec(case.samples[i])
+            curves[i] = extract(batch_summaries[i // BATCH_SIZE], spec, ["shrinkage"], sample=i)["shrinkage"]
+        write_curves(produces, RaggedCurves.from_dict(curves))
+
+    frame_counts = np.unique(np.geomspace(1, case.sample_count, 50, dtype=int))
+    for frame, count in enumerate([case.sample_count, *frame_counts]):
 
         @task(id=f"{case.key}{frame or ''}")
         @mark.plot
         def task_plot_shrinkage_randomized(
             produces=image_produces(case.dir() / "shrinkage" / (f"{frame:02}" if frame else "")),
-            results_files=[case.dir(i) / "output.parquet" for i, _ in enumerate(case.samples)][:count],
-            nominal_result=NOMINAL.dir() / "output.parquet",
+            curve_file=case.curves("shrinkage"),
+            nominal_summary=NOMINAL.dir() / "summary.parquet",
             case=case,
-            alpha=0.5 - (count / SAMPLE_COUNT) * 0.4,
+            count=count,
+            alpha=0.5 - (count / case.sample_count) * 0.4,
         ):
-            nominal_df = pq.read_table(nominal_result).flatten().flatten()
-            data_frames = read_parquet_output_files(results_files)
+            curves = read_curves(curve_file, count)
 
             fig = plt.figure(figsize=tuple(DEFAULT_FIGSIZE * [1, 2]))
             gs = GridSpec(3, 2, figure=fig)
@@ -45,29 +56,25 @@ for case in CASES:
             axs[0].set_ylim(*SHRINKAGE_LIMITS)
             axs[0].grid(True, "both")
 
-            cuts = {t: np.zeros_like(results_files) for t in CUTS}
-            mean_supports = {t: np.zeros_like(results_files) for t in np.geomspace(1e-7, 1e-3, 100)}
             sample_label = "Individual Samples"
 
-            for i, df in data_frames:
-                sample = case.samples[i]
-                times, values = get_shrinkages_shoelace(sample, df)
+            for _, (times, values) in curves.items():
                 axs[0].plot(times, values, **case.LINE_STYLE, alpha=alpha, label=sample_label)
                 sample_label = None
 
-                for t, arr in cuts.items():
-                    arr[i] = np.interp(t, times, values)
-
-                for t, arr in mean_supports.items():
-                    arr[i] = np.interp(t, times, values)
+            cuts = curves.resample(CUTS)
 
-            for i, (t, arr) in enumerate(cuts.items()):
+            for i, (t, arr) in enumerate(zip(CUTS, cuts.T, strict=True)):
                 axs[0].axvline(t, color=CUT_COLORS[i])
                 axs[i + 1].set_title(
                     f"$\\Time / \\TimeNorm_{{\\Surface}} = \\num[print-unity-mantissa=false]{{{t:.0e}}}$"
                 )
                 axs[i + 1].hist(
-                    arr, bins=np.geomspace(*SHRINKAGE_LIMITS, 51), density=True, color=CUT_COLORS[i], alpha=0.5
+                    arr,
+                    bins=np.geomspace(*SHRINKAGE_LIMITS, 51),
+                    density=True,
+                    color=CUT_COLORS[i],
+                    alpha=0.5,
                 )
                 mean = np.mean(arr)
                 std = np.std(arr)
@@ -84,7 +91,7 @@ for case in CASES:
                 )
                 axs[i + 1].axvline(mean - std, color=CUT_COLORS[i], ls="--")
 
-            times, values = get_shrinkages_shoelace(NOMINAL.input, nominal_df)
+            times, values = extract(nominal_summary, metric_spec(NOMINAL.input), ["shrinkage"])["shrinkage"]
             axs[0].plot(times, values, **NOMINAL.LINE_STYLE, label=NOMINAL.display)
 
             for i, v in enumerate(np.interp(t, times, values) for t in CUTS):
@@ -92,8 +99,12 @@ for case in CASES:
                     v, **NOMINAL.LINE_STYLE, label=f"$\\text{{nom.}} = \\qty{{{v * 100:.3f}}}{{\\percent}}$"
                 )
 
-            times, values = np.asarray(list(mean_supports.keys())), np.mean(list(mean_supports.values()), axis=-1)
-            axs[0].plot(times, values, **MEAN_LINE_STYLE, label="Mean of Samples")
+            axs[0].plot(
+                MEAN_SUPPORTS,
+                np.mean(curves.resample(MEAN_SUPPORTS), axis=0),
+                **MEAN_LINE_STYLE,
+                label="Mean of Samples",
+            )
 
             axs[0].set_xlabel("Normalized Time $\\Time / \\TimeNorm_{\\Surface}$")
             axs[0].set_ylabel("Shrinkage $\\Shrinkage$")
@@ -109,43 +120,3 @@ for case in CASES:
                 fig.savefig(p)
 
             plt.close(fig)
-
-
-def shoelace(x: np.ndarray, y: np.ndarray):
-    x_diffs = x - np.roll(x, -1)
-    y_sums = y + np.roll(y, -1)
-    return np.sum(x_diffs * y_sums) / 2
-
-
-def get_shrinkages_shoelace(input: Input, df: pa.Table):
-    particles: list[pd.DataFrame] = [
-        (
-            df.filter(pc.field("Particle.Id") == p.id.bytes)
-            .group_by(["State.Id"])
-            .aggregate([("State.Time", "one"), ("Particle.Coordinates.X", "one"), ("Particle.Coordinates.Y", "one")])
-            .sort_by("State.Time_one")
-            .to_pandas()
-        )
-        for p in input.particles
-    ]
-
-    times = particles[0]["State.Time_one"].to_numpy() / TIME_NORM_SURFACE
-    mask = np.diff(times, prepend=[0]) > 0
-
-    if len(particles) > 2:
-        x = np.array([p["Particle.Coordinates.X_one"].to_numpy() for p in particles]).T
-        y = np.array([p["Particle.Coordinates.Y_one"].to_numpy() for p in particles]).T
-        volumes = np.array([shoelace(x_, y_) for x_, y_ in zip(x, y, strict=False)])
-        volume0 = volumes[0]
-        shrinkages = (volume0 - volumes[mask]) / volume0
-    else:
-        distances = distance(
-            particles[0]["Particle.Coordinates.X_one"].to_numpy(),
-            particles[0]["Particle.Coordinates.Y_one"].to_numpy(),
-            particles[1]["Particle.Coordinates.X_one"].to_numpy(),
-            particles[1]["Particle.Coordinates.Y_one"].to_numpy(),
-        )
-        distance0 = distances[0]
-        shrinkages = (distance0 - distances[mask]) / distance0
-
-    return times[mask], shrinkages
@@ -1,62 +1,118 @@
-import subprocess
-import time
+import json
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pytask import mark, task
-from rich.markup import escape
 
-from dissertation.sim.randomized.cases import CASES, NOMINAL
+from dissertation.sim.projects import executable
+from dissertation.sim.randomized.cases import CAMPAIGN_FILE, CASES, NOMINAL
+from dissertation.sim.randomized.ensemble import check_outputs, output_file
+from dissertation.sim.randomized.helper import successful_samples
+from dissertation.sim.randomized.manifest import read_samples, write_manifest
+from dissertation.sim.scheduling import estimate_cost, estimate_memory
+from dissertation.sim.state_index import INDEX_SCHEMA, build_state_index, index_file, write_state_index
+from dissertation.sim.summary import summarize, write_summary
+from dissertation.sim.worker import run_batch, run_simulation
 
 THIS_DIR = Path(__file__).parent
 
 for case in CASES:
-    for i, sample in enumerate(case.samples):
 
-        @task(id=f"{case.key}/{i}")
-        @mark.sim
-        def task_randomized_create_sample(
-            produces=case.dir(i) / "input.json",
-            sample=sample,
-            case_module=THIS_DIR / "cases.py",
-            input_module=THIS_DIR / "input.py",
+    @task(id=case.key)
+    @mark.sim
+    def task_randomized_create_manifest(
+        produces=case.manifest(),
+        case=case,
+        case_module=THIS_DIR / "cases.py",
+        input_module=THIS_DIR / "input.py",
+        manifest_module=THIS_DIR / "manifest.py",
+        campaign_file=CAMPAIGN_FILE,
+    ):
+        write_manifest(case, produces)
+
+    for b, samples in enumerate(case.batches()):
+
+        @task(id=f"{case.key}/{b}")
+        @mark.persist
+        @mark.sim(
+            cost=lambda case=case, samples=samples: sum(estimate_cost(case.sample(i)) for i in samples),
+            memory=lambda case=case, samples=samples: max(estimate_memory(case.sample(i)) for i in samples),
+        )
+        def task_randomized_run_batch(
+            manifest=case.manifest(),
+            case=case,
+            samples=samples,
+            solver=executable("randomized"),
+            produces=case.batch_report(b),
         ):
+            jobs = []
+            for i, input in read_samples(manifest, samples).items():
+                case.dir(i).mkdir(exist_ok=True, parents=True)
+                sample_produces = {"output": case.dir(i) / "output.parquet", "time": case.dir(i) / "time.txt"}
+                jobs.append((input.model_dump_json(), sample_produces))
+            results = run_batch(solver, jobs)
+
+            # The per-sample outputs are not declared as products, since failed samples leave none behind. The report
+            # is the only record of which outputs exist, so a sample only counts as successful once its output reads.
+            report = [
+                dict(sample=i, success=r.success, duration=r.duration, error=r.error)
+                for i, r in zip(samples, results, strict=True)
+            ]
+            outputs = check_outputs(case, [r["sample"] for r in report if r["success"]])
+            for r in report:
+                if r["sample"] in outputs.missing:
+                    r.update(success=False, error="solver succeeded, but wrote no output")
+                elif r["sample"] in outputs.corrupt:
+                    r.update(
+                        success=False,
+                        error=f"solver succeeded, but wrote an unreadable output: {outputs.corrupt[r['sample']]}",
+                    )
+
             produces.parent.mkdir(exist_ok=True, parents=True)
-            produces.write_text(sample.model_dump_json(indent=4))
+            produces.write_text(json.dumps(report, indent=4))
 
-        @task(id=f"{case.key}/{i}")
-        @mark.persist
+            failed = [r["sample"] for r in report if not r["success"]]
+            if failed:
+                print(f"Samples {failed} failed.")
+
+        @task(id=f"{case.key}/{b}")
         @mark.sim
-        def task_randomized_run_sample(
-            input_file=case.dir(i) / "input.json",
-            produces={"output": case.dir(i) / "output.parquet", "time": case.dir(i) / "time.txt"},
-            csharp_proj=THIS_DIR / "randomized.csproj",
+        def task_randomized_summarize_batch(
+            batch_report=case.batch_report(b),
+            case=case,
+            b=b,
+            produces=case.batch_summary(b),
         ):
-            start = time.time()
-            result = subprocess.run(
-                [
-                    "dotnet",
-                    "run",
-                    "-c",
-                    "Release",
-                    "--project",
-                    str(csharp_proj),
-                    str(input_file),
-                    str(produces["output"]),
-                ],
-                cwd=str(input_file.parent),
-                check=False,
-                capture_output=True,
-                text=True,
-            )
-
-            end = time.time()
+            outputs = check_outputs(case, successful_samples([batch_report]))
+            if outputs.missing or outputs.corrupt:
+                raise RuntimeError(
+                    f"Outputs of successful samples of batch {case.key}/{b} are unreadable: {outputs}\n"
+                    + "\n".join(f"    {i}: {e}" for i, e in sorted(outputs.corrupt.items()))
+                )
+
+            summaries = []
+            for i in outputs.available:
+                summary = summarize(output_file(case, i))
+                summaries.append(summary.add_column(0, "Sample", pa.array([i] * summary.num_rows, pa.int32())))
 
-            print("=== OUT ===\n", escape(result.stdout))
-            print("=== ERR ===\n", escape(result.stderr))
-
-            produces["time"].write_text(str(end - start))
+            produces.parent.mkdir(exist_ok=True, parents=True)
+            pq.write_table(
+                pa.concat_tables(summaries) if summaries else pa.table({"Sample": pa.array([], pa.int32())}), produces
+            )
 
-            result.check_returncode()
+        @task(id=f"{case.key}/{b}")
+        @mark.sim
+        def task_randomized_index_batch(
+            batch_report=case.batch_report(b),
+            case=case,
+            produces={i: index_file(output_file(case, i)) for i in samples},
+        ):
+            # failed samples have no output to index, their indices stay empty
+            successful = set(successful_samples([batch_report]))
+            for i, file in produces.items():
+                runs = build_state_index(output_file(case, i)) if i in successful else INDEX_SCHEMA.empty_table()
+                write_state_index(runs, file)
 
 
 @mark.sim
@@ -70,35 +126,18 @@ def task_randomized_create_nominal(
 
 
 @mark.persist
-@mark.sim
+@mark.sim(cost=estimate_cost(NOMINAL.input), memory=estimate_memory(NOMINAL.input))
 def task_randomized_run_nominal(
     input_file=NOMINAL.dir() / "input.json",
     produces={"output": NOMINAL.dir() / "output.parquet", "time": NOMINAL.dir() / "time.txt"},
-    csharp_proj=THIS_DIR / "randomized.csproj",
+    solver=executable("randomized"),
+):
+    run_simulation(solver, input_file, produces)
+
+
+@mark.sim
+def task_randomized_summarize_nominal(
+    results_file=NOMINAL.dir() / "output.parquet",
+    produces=NOMINAL.dir() / "summary.parquet",
 ):
-    start = time.time()
-    result = subprocess.run(
-        [
-            "dotnet",
-            "run",
-            "-c",
-            "Release",
-            "--project",
-            str(csharp_proj),
-            str(input_file),
-            str(produces["output"]),
-        ],
-        cwd=str(input_file.parent),
-        check=False,
-        capture_output=True,
-        text=True,
-    )
-
-    end = time.time()
-
-    print("=== OUT ===\n", escape(result.stdout))
-    print("=== ERR ===\n", escape(result.stderr))
-
-    produces["time"].write_text(str(end - start))
-
-    result.check_returncode()
+    write_summary(results_file, produces)
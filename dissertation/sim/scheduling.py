@@ -0,0 +1,149 @@
+import os
+import warnings
+
+import networkx as nx
+import numpy as np
+from attrs import define, field
+from pytask import Session, get_marks, hookimpl
+
+from dissertation.sim.cost_model import DEFAULT_TIME_STEP_ANGLE_LIMIT, load_model, node_count
+
+try:
+    # private API of pytask 0.5, pinned in pyproject.toml
+    from _pytask.dag_utils import TopologicalSorter
+except ImportError:
+    TopologicalSorter = None
+
+TASK_WORKERS_VARIABLE = "SIM_TASK_WORKERS"
+WORKER_BASE_MEMORY = 500e6
+MEMORY_PER_NODE = 2e6
+
+
+def estimate_cost(input) -> float:
+    """expected runtime of a simulation, in seconds if a fitted cost model is available, else only relative"""
+    if model := load_model():
+        return model.predict(input)
+
+    time_step_angle_limit = getattr(input, "time_step_angle_limit", DEFAULT_TIME_STEP_ANGLE_LIMIT)
+    return node_count(input) ** 1.5 * max(np.log10(input.duration), 1) / time_step_angle_limit
+
+
+def estimate_memory(input) -> float:
+    """expected peak memory demand of a simulation in bytes"""
+    return WORKER_BASE_MEMORY + MEMORY_PER_NODE * node_count(input)
+
+
+def default_memory_limit() -> float:
+    if limit := os.environ.get("SIM_MEMORY_LIMIT"):
+        return float(limit) * 1e9
+
+    try:
+        return 0.8 * os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return np.inf
+
+
+@define
+class ResourceAwareSorter(TopologicalSorter or object):
+    """Topological sorter which starts the most expensive chains of simulation tasks first.
+
+    Simulation tasks announce their expected cost and memory demand via ``mark.sim(cost=..., memory=...)``,
+    either as values or as callables evaluated only when building.
+    Ready tasks are ordered by their upward rank, i.e. their own cost plus the most expensive chain of tasks
+    depending on them, so that long simulations and their inputs are started early and packed longest first.
+    Tasks are held back while their memory demand would exceed the limit together with the running ones.
+    """
+
+    ranks: dict[str, float] = field(factory=dict)
+    memory: dict[str, float] = field(factory=dict)
+    memory_limit: float = np.inf
+    _memory_in_use: float = 0
+
+    @classmethod
+    def from_session(cls, session: Session, memory_limit: float | None = None) -> "ResourceAwareSorter":
+        sorter = cls.from_dag(session.dag)
+        sorter.memory_limit = default_memory_limit() if memory_limit is None else memory_limit
+
+        costs = {}
+        for task in session.tasks:
+            for mark in get_marks(task, "sim"):
+                costs[task.signature] = _evaluate(mark.kwargs.get("cost", 0))
+                sorter.memory[task.signature] = _evaluate(mark.kwargs.get("memory", 0))
+
+        for node in reversed(list(nx.topological_sort(sorter.dag))):
+            sorter.ranks[node] = costs.get(node, 0) + max(
+                (sorter.ranks[s] for s in sorter.dag.successors(node)), default=0
+            )
+
+        return sorter
+
+    def get_ready(self, n: int = 1) -> list[str]:
+        if not isinstance(n, int) or n < 1:
+            msg = "'n' must be an integer greater or equal than 1."
+            raise ValueError(msg)
+
+        ready_nodes = {v for v, d in self.dag.in_degree() if d == 0} - self._nodes_processing
+        candidates = sorted(ready_nodes, key=lambda x: (self.priorities.get(x, 0), self.ranks.get(x, 0)), reverse=True)
+
+        selected = []
+        for node in candidates:
+            if len(selected) >= n:
+                break
+
+            memory = self.memory.get(node, 0)
+            if self._memory_in_use > 0 and self._memory_in_use + memory > self.memory_limit:
+                continue
+
+            self._memory_in_use += memory
+            selected.append(node)
+
+        self._nodes_processing.update(selected)
+
+        return selected
+
+    def done(self, *nodes: str) -> None:
+        for node in nodes:
+            if node in self._nodes_processing:
+                self._memory_in_use -= self.memory.get(node, 0)
+        super().done(*nodes)
+
+
+def in_parallel_build() -> bool:
+    """whether tasks run in the worker processes of pytask-parallel, which must not start process pools of their own"""
+    return int(os.environ.get(TASK_WORKERS_VARIABLE, 1)) > 1
+
+
+def task_cores() -> int:
+    """cores available to a single task, sharing the cores of the process among the parallel pytask workers"""
+    return max(1, len(os.sched_getaffinity(0)) // int(os.environ.get(TASK_WORKERS_VARIABLE, 1)))
+
+
+def _evaluate(value):
+    return value() if callable(value) else value
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session):
+    # inherited by the workers of pytask-parallel started during the build
+    os.environ[TASK_WORKERS_VARIABLE] = str(session.config.get("n_workers", 1))
+
+    if TopologicalSorter is None:
+        warnings.warn(
+            "pytask's TopologicalSorter is not available, simulations are scheduled in default order.", stacklevel=2
+        )
+    else:
+        session.scheduler = ResourceAwareSorter.from_session(session)
+    return (yield)
+
+
+@hookimpl(trylast=True)
+def pytask_execute_task_teardown(session: Session):
+    # pytask rebuilds a plain sorter when it resolves provisional nodes during the build
+    replaced = TopologicalSorter is not None and not isinstance(session.scheduler, ResourceAwareSorter)
+    if replaced and not session.config.get("_sim_scheduler_replaced"):
+        session.config["_sim_scheduler_replaced"] = True
+        warnings.warn(
+            f"pytask replaced the resource-aware scheduler by {type(session.scheduler).__name__}, the remaining "
+            "simulations are scheduled in default order.",
+            stacklevel=2,
+        )
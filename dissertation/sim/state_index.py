@@ -0,0 +1,193 @@
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dissertation.sim.output import (
+    FLAT_CACHE_SUFFIX,
+    NODE_COORDINATE_COLUMNS,
+    iter_output,
+    pivot_by_particle,
+    read_flat_cache,
+    read_output,
+)
+
+INDEX_COLUMNS = ["State.Id", "State.Time", "Particle.Id"]
+INDEX_SCHEMA = pa.schema(
+    [
+        ("State.Id", pa.binary()),
+        ("State.Time", pa.float64()),
+        ("Particle.Id", pa.binary()),
+        ("Start", pa.int64()),
+        ("End", pa.int64()),
+    ]
+)
+
+
+def index_file(output_file: Path) -> Path:
+    return output_file.with_name(f"{output_file.name}.index.parquet")
+
+
+def _changes(array: pa.Array | pa.ChunkedArray) -> np.ndarray:
+    return pc.not_equal(array[1:], array[:-1]).to_numpy(zero_copy_only=False)
+
+
+def build_state_index(output_file: Path) -> pa.Table:
+    """Locate the contiguous runs of rows of each state and particle in a single streaming scan of the id columns.
+
+    Returns one row per run with the state id and time, the particle id and the row range ``Start:End`` in the output.
+    """
+    runs = []
+    previous = None
+    offset = 0
+
+    for batch in iter_output(output_file, INDEX_COLUMNS):
+        if batch.num_rows == 0:
+            continue
+
+        state_ids, particle_ids = batch["State.Id"], batch["Particle.Id"]
+        first = (state_ids[0].as_py(), particle_ids[0].as_py())
+        starts = np.flatnonzero(np.concatenate([[first != previous], _changes(state_ids) | _changes(particle_ids)]))
+
+        runs.append(batch.take(starts).append_column("Start", pa.array(starts + offset, pa.int64())))
+        previous = (state_ids[-1].as_py(), particle_ids[-1].as_py())
+        offset += batch.num_rows
+
+    if not runs:
+        empty = read_output(output_file, INDEX_COLUMNS)
+        return empty.append_column("Start", pa.array([], pa.int64())).append_column("End", pa.array([], pa.int64()))
+
+    table = pa.Table.from_batches(runs)
+    return table.append_column("End", pa.array(np.append(table["Start"].to_numpy()[1:], offset), pa.int64()))
+
+
+@dataclass(frozen=True)
+class StateIndex:
+    """Runs of rows per state and particle of a simulation output with the states ordered by time.
+
+    Positions refer to the states in time order. ``monotonic`` marks the states whose time exceeds the times of all
+    preceding states, i.e. those kept when repeated time stamps are skipped.
+    """
+
+    runs: pa.Table
+
+    @cached_property
+    def _states(self) -> dict[str, np.ndarray]:
+        changes = np.concatenate([[True], _changes(self.runs["State.Id"])]) if self.runs.num_rows else []
+        first_runs = np.flatnonzero(changes)
+        if len(pc.unique(self.runs["State.Id"])) != len(first_runs):
+            raise ValueError("rows of a state are not contiguous in the simulation output")
+
+        times = self.runs["State.Time"].to_numpy()[first_runs]
+        order = np.argsort(times, kind="stable")
+        positions = np.empty_like(order)
+        positions[order] = np.arange(len(order))
+
+        starts = self.runs["Start"].to_numpy()
+        ends = np.append(starts[first_runs][1:], self.runs["End"].to_numpy()[-1:])
+        return dict(
+            times=times[order],
+            starts=starts[first_runs][order],
+            ends=ends[order],
+            run_positions=positions[np.cumsum(changes, dtype=int) - 1],
+        )
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._states["times"]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._states["starts"]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self._states["ends"]
+
+    @cached_property
+    def monotonic(self) -> np.ndarray:
+        return np.diff(self.times, prepend=[0]) > 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def runs_of(self, positions: Sequence[int]) -> np.ndarray:
+        """indices of the runs belonging to the states at the given positions, in the order of the positions"""
+        run_positions = self._states["run_positions"]
+        order = np.argsort(run_positions, kind="stable")
+        bounds = np.searchsorted(run_positions[order], [positions, np.add(positions, 1)])
+        return np.concatenate([order[a:b] for a, b in bounds.T]) if len(positions) else np.empty(0, dtype=int)
+
+
+def write_state_index(runs: pa.Table, file: Path):
+    """store the runs of a state index, written aside and renamed, so that readers never see a partial index"""
+    file.parent.mkdir(exist_ok=True, parents=True)
+    tmp = file.with_name(f".{file.name}.{os.getpid()}")
+    pq.write_table(runs, tmp)
+    tmp.replace(file)
+
+
+def load_state_index(file: Path) -> StateIndex:
+    """state index from an index file as produced by the index tasks"""
+    return StateIndex(pq.read_table(file))
+
+
+def read_states(output_file: Path, index: StateIndex, positions: Sequence[int], columns: Sequence[str]) -> pa.Table:
+    """Read the rows of the states at the given positions, decoding only the row groups that hold them.
+
+    The result has the flattened column names of :func:`read_output` and the rows of the states in the given order.
+    From a flat cache, the rows are zero-copy slices of the memory-mapped file.
+    """
+    positions = np.asarray(positions, dtype=int)
+    if output_file.suffix == FLAT_CACHE_SUFFIX:
+        table = read_flat_cache(output_file, columns)
+        slices = [table.slice(s, e - s) for s, e in zip(index.starts[positions], index.ends[positions], strict=True)]
+        return pa.concat_tables([table.slice(0, 0), *slices])
+
+    parquet_file = pq.ParquetFile(output_file)
+    sizes = [parquet_file.metadata.row_group(g).num_rows for g in range(parquet_file.num_row_groups)]
+    group_starts = np.concatenate([[0], np.cumsum(sizes, dtype=int)])
+
+    starts, ends = index.starts[positions], index.ends[positions]
+    first_groups = np.searchsorted(group_starts, starts, side="right") - 1
+    last_groups = np.searchsorted(group_starts, ends - 1, side="right") - 1
+    spans = [np.arange(a, b + 1) for a, b in zip(first_groups, last_groups, strict=True)]
+    groups = np.unique(np.concatenate([np.empty(0, dtype=int), *spans]))
+
+    table = parquet_file.read_row_groups(groups.tolist(), columns=list(columns))
+    while any(pa.types.is_struct(f.type) for f in table.schema):
+        table = table.flatten()
+
+    # row of the output at the start of each read row group within the read table
+    shifts = np.full(len(sizes), 0)
+    shifts[groups] = np.concatenate([[0], np.cumsum(np.diff(group_starts)[groups])[:-1]]) - group_starts[groups]
+    rows = [np.arange(s, e) + shifts[g] for s, e, g in zip(starts, ends, first_groups, strict=True)]
+    return table.select(list(columns)).take(np.concatenate([np.empty(0, dtype=int), *rows]))
+
+
+def read_particle_outlines(
+    file: Path, particle_ids: Sequence[bytes], index: StateIndex | None = None, positions: Sequence[int] | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Node coordinates of the states at the given positions of the state index, all states by default.
+
+    Returns the state times and the coordinates as states × particles arrays of coordinate arrays. The node lists are
+    cut from the rows of the states along the indexed runs, so neither a group by nor a sort of the nodes is needed.
+    """
+    index = load_state_index(index_file(file)) if index is None else index
+    positions = np.arange(len(index)) if positions is None else np.asarray(positions, dtype=int)
+    nodes = read_states(file, index, positions, NODE_COORDINATE_COLUMNS)
+
+    runs = index.runs.take(index.runs_of(positions))
+    offsets = pa.array(np.concatenate([[0], np.cumsum(pc.subtract(runs["End"], runs["Start"]).to_numpy())]), pa.int32())
+    outlines = runs.select(INDEX_COLUMNS)
+    for c in NODE_COORDINATE_COLUMNS:
+        outlines = outlines.append_column(c, pa.ListArray.from_arrays(offsets, nodes[c].combine_chunks()))
+
+    times, coordinates = pivot_by_particle(outlines, particle_ids, NODE_COORDINATE_COLUMNS)
+    return times, coordinates["Node.Coordinates.X"], coordinates["Node.Coordinates.Y"]
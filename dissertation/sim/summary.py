@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dissertation.sim.output import GRAIN_BOUNDARY, PARTICLE_COLUMNS, STATE_COLUMNS, iter_output, read_output
+
+SUMMARY_SOURCE_COLUMNS = [
+    *STATE_COLUMNS,
+    *PARTICLE_COLUMNS,
+    "Node.Type",
+    "Node.SurfaceDistance.ToUpper",
+    "Node.SurfaceDistance.ToLower",
+    "Node.Volume.ToUpper",
+]
+
+PARTIAL_AGGREGATES = [
+    ("State.Time", "one"),
+    ("Particle.Coordinates.X", "one"),
+    ("Particle.Coordinates.Y", "one"),
+    ("Particle.Volume", "sum"),
+    ("GrainBoundary.Count", "sum"),
+    ("GrainBoundary.ToUpper", "sum"),
+    ("GrainBoundary.ToLower", "sum"),
+]
+"""aggregates of the summary columns, valid for both node rows and partial summaries of a state and particle"""
+
+SUMMARY_COLUMNS = ["State.Id", "Particle.Id", *(c for c, _ in PARTIAL_AGGREGATES)]
+
+COMPACTION_ROWS = 1 << 20
+
+
+def _aggregate(table: pa.Table) -> pa.Table:
+    return (
+        table.group_by(["State.Id", "Particle.Id"], use_threads=False)
+        .aggregate(PARTIAL_AGGREGATES)
+        .rename_columns(SUMMARY_COLUMNS)
+    )
+
+
+def _node_batch_summary(batch: pa.RecordBatch) -> pa.Table:
+    is_grain_boundary = pc.equal(batch["Node.Type"], GRAIN_BOUNDARY)
+    return _aggregate(
+        pa.table(
+            {
+                "State.Id": batch["State.Id"],
+                "Particle.Id": batch["Particle.Id"],
+                "State.Time": batch["State.Time"],
+                "Particle.Coordinates.X": batch["Particle.Coordinates.X"],
+                "Particle.Coordinates.Y": batch["Particle.Coordinates.Y"],
+                "Particle.Volume": batch["Node.Volume.ToUpper"],
+                "GrainBoundary.Count": pc.cast(is_grain_boundary, pa.int32()),
+                "GrainBoundary.ToUpper": pc.if_else(is_grain_boundary, batch["Node.SurfaceDistance.ToUpper"], 0.0),
+                "GrainBoundary.ToLower": pc.if_else(is_grain_boundary, batch["Node.SurfaceDistance.ToLower"], 0.0),
+            }
+        )
+    )
+
+
+def summarize(output_file: Path) -> pa.Table:
+    """Reduce the node history of a simulation to one row per state and particle in a single streaming scan.
+
+    The summary holds the state time, the particle coordinates, the particle volume as sum of node volumes and the
+    count and summed surface distances of the grain boundary nodes, ordered by time and particle id. The output is
+    read batch by batch, each batch is reduced to partial per-state aggregates, which are merged as they accumulate,
+    so that memory scales with the number of states instead of the number of node rows.
+    """
+    partials = []
+    partial_rows = 0
+    compacted_rows = 0
+
+    for batch in iter_output(output_file, SUMMARY_SOURCE_COLUMNS):
+        partial = _node_batch_summary(batch)
+        partials.append(partial)
+        partial_rows += partial.num_rows
+
+        if len(partials) > 1 and partial_rows > max(COMPACTION_ROWS, 2 * compacted_rows):
+            partials = [_aggregate(pa.concat_tables(partials))]
+            partial_rows = compacted_rows = partials[0].num_rows
+
+    if partials:
+        summary = _aggregate(pa.concat_tables(partials))
+    else:
+        summary = _node_batch_summary(
+            pa.RecordBatch.from_pylist([], schema=read_output(output_file, SUMMARY_SOURCE_COLUMNS).schema)
+        )
+
+    return summary.sort_by([("State.Time", "ascending"), ("State.Id", "ascending"), ("Particle.Id", "ascending")])
+
+
+def write_summary(output_file: Path, summary_file: Path):
+    summary_file.parent.mkdir(exist_ok=True, parents=True)
+    pq.write_table(summarize(output_file), summary_file)
+
+
+def read_summary(summary_file: Path, filter: pc.Expression | None = None) -> pa.Table:
+    return pq.read_table(summary_file, filters=filter)
+
+
+def state_summary(summary: pa.Table) -> pa.Table:
+    """summary aggregated over all particles per state, ordered by time"""
+    return (
+        summary.group_by(["State.Id"], use_threads=False)
+        .aggregate(
+            [
+                ("State.Time", "one"),
+                ("Particle.Volume", "sum"),
+                ("GrainBoundary.Count", "sum"),
+                ("GrainBoundary.ToUpper", "sum"),
+                ("GrainBoundary.ToLower", "sum"),
+            ]
+        )
+        .rename_columns(
+            [
+                "State.Id",
+                "State.Time",
+                "Particle.Volume",
+                "GrainBoundary.Count",
+                "GrainBoundary.ToUpper",
+                "GrainBoundary.ToLower",
+            ]
+        )
+        .sort_by("State.Time")
+    )
@@ -0,0 +1,35 @@
+import subprocess
+
+from pytask import mark, task
+from rich.markup import escape
+
+from dissertation.sim.projects import PROJECTS, executable, sources
+
+for name, csharp_proj in PROJECTS.items():
+
+    @task(id=name)
+    @mark.sim
+    def task_publish_simulation(
+        csharp_proj=csharp_proj,
+        sources=sources(name),
+        produces=executable(name),
+    ):
+        result = subprocess.run(
+            [
+                "dotnet",
+                "publish",
+                str(csharp_proj),
+                "-c",
+                "Release",
+                "-o",
+                str(produces.parent),
+            ],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+
+        print("=== OUT ===\n", escape(result.stdout))
+        print("=== ERR ===\n", escape(result.stderr))
+
+        result.check_returncode()
@@ -18,157 +18,170 @@ using RefraSin.TEPSolver;
 using RefraSin.TEPSolver.StepWidthControllers;
 using Serilog;
 
-Log.Logger = new LoggerConfiguration()
-    .MinimumLevel.Information()
-    .WriteTo.File("run.log")
-    .WriteTo.Console()
-    .CreateLogger();
-
-var inputFile = args[0];
-var outputFile = args[1];
-
-var inputText = File.ReadAllText(inputFile, encoding: Encoding.UTF8);
-
-var input =
-    JsonSerializer.Deserialize<Input>(
-        inputText,
-        new JsonSerializerOptions { PropertyNamingPolicy = JsonNamingPolicy.SnakeCaseLower }
-    ) ?? throw new ArgumentNullException("input");
-
-var material1Id = Guid.NewGuid();
-var material2Id = Guid.NewGuid();
-
-var material1 = new ParticleMaterial(
-    material1Id,
-    "material1",
-    SubstanceProperties.FromDensityAndMolarMass(input.Material1.Density, input.Material1.MolarMass),
-    new InterfaceProperties(
-        input.Material1.Surface.DiffusionCoefficient,
-        input.Material1.Surface.Energy
-    ),
-    new Dictionary<Guid, IInterfaceProperties>
-    {
+if (args is ["--worker"])
+{
+    SimulationWorker.Serve(Simulate);
+}
+else
+{
+    Simulate(File.ReadAllText(args[0], encoding: Encoding.UTF8), args[1]);
+}
+
+void Simulate(string inputText, string outputFile)
+{
+    Log.Logger = new LoggerConfiguration()
+        .MinimumLevel.Information()
+        .WriteTo.File("run.log")
+        .WriteTo.Console()
+        .CreateLogger();
+
+    var input =
+        JsonSerializer.Deserialize<Input>(
+            inputText,
+            new JsonSerializerOptions { PropertyNamingPolicy = JsonNamingPolicy.SnakeCaseLower }
+        ) ?? throw new ArgumentNullException("input");
+
+    var material1Id = Guid.NewGuid();
+    var material2Id = Guid.NewGuid();
+
+    var material1 = new ParticleMaterial(
+        material1Id,
+        "material1",
+        SubstanceProperties.FromDensityAndMolarMass(
+            input.Material1.Density,
+            input.Material1.MolarMass
+        ),
+        new InterfaceProperties(
+            input.Material1.Surface.DiffusionCoefficient,
+            input.Material1.Surface.Energy
+        ),
+        new Dictionary<Guid, IInterfaceProperties>
         {
-            material2Id,
-            new InterfaceProperties(
-                input.Material1.GrainBoundary.DiffusionCoefficient,
-                input.Material1.GrainBoundary.Energy
-            )
-        },
-    }
-);
-
-var material2 = new ParticleMaterial(
-    material2Id,
-    "material2",
-    SubstanceProperties.FromDensityAndMolarMass(input.Material2.Density, input.Material2.MolarMass),
-    new InterfaceProperties(
-        input.Material2.Surface.DiffusionCoefficient,
-        input.Material2.Surface.Energy
-    ),
-    new Dictionary<Guid, IInterfaceProperties>
-    {
+            {
+                material2Id,
+                new InterfaceProperties(
+                    input.Material1.GrainBoundary.DiffusionCoefficient,
+                    input.Material1.GrainBoundary.Energy
+                )
+            },
+        }
+    );
+
+    var material2 = new ParticleMaterial(
+        material2Id,
+        "material2",
+        SubstanceProperties.FromDensityAndMolarMass(
+            input.Material2.Density,
+            input.Material2.MolarMass
+        ),
+        new InterfaceProperties(
+            input.Material2.Surface.DiffusionCoefficient,
+            input.Material2.Surface.Energy
+        ),
+        new Dictionary<Guid, IInterfaceProperties>
         {
-            material1Id,
-            new InterfaceProperties(
-                input.Material2.GrainBoundary.DiffusionCoefficient,
-                input.Material2.GrainBoundary.Energy
-            )
-        },
-    }
-);
-
-var particle1 = new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
-    material1Id,
-    (input.Particle1.X, input.Particle1.Y),
-    input.Particle1.RotationAngle,
-    input.Particle1.NodeCount,
-    input.Particle1.Radius,
-    input.Particle1.Ovality,
-    input.Particle1.PeakCount,
-    input.Particle1.PeakHeight
-).GetParticle(input.Particle1.Id);
-
-var particle2 = new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
-    material2Id,
-    (input.Particle2.X, input.Particle2.Y),
-    input.Particle2.RotationAngle,
-    input.Particle2.NodeCount,
-    input.Particle2.Radius,
-    input.Particle2.Ovality,
-    input.Particle2.PeakCount,
-    input.Particle2.PeakHeight
-).GetParticle(input.Particle2.Id);
-
-var initialState = new SystemState(Guid.Empty, 0, [particle1, particle2]);
-
-ParticlePlot
-    .PlotParticles<IParticle<IParticleNode>, IParticleNode>(initialState.Particles)
-    .SaveHtml("initialState.html");
-
-var compactedState = new FocalCompactionStep(
-    new AbsolutePoint(0, 0),
-    stepDistance: 0,
-    minimumIntrusion: 0.5e-6,
-    maxStepCount: 1
-).Solve(initialState);
-
-ParticlePlot
-    .PlotParticles<IParticle<IParticleNode>, IParticleNode>(compactedState.Particles)
-    .SaveHtml("compactedState.html");
-
-var routines = SolverRoutines.Default with
-{
-    Remeshers = YieldRemeshers(),
-    StepWidthController = new MaximumDisplacementAngleStepWidthController(
-        maximumDisplacementAngle: input.TimeStepAngleLimit
-    ),
-};
+            {
+                material1Id,
+                new InterfaceProperties(
+                    input.Material2.GrainBoundary.DiffusionCoefficient,
+                    input.Material2.GrainBoundary.Energy
+                )
+            },
+        }
+    );
+
+    var particle1 = new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
+        material1Id,
+        (input.Particle1.X, input.Particle1.Y),
+        input.Particle1.RotationAngle,
+        input.Particle1.NodeCount,
+        input.Particle1.Radius,
+        input.Particle1.Ovality,
+        input.Particle1.PeakCount,
+        input.Particle1.PeakHeight
+    ).GetParticle(input.Particle1.Id);
+
+    var particle2 = new ShapeFunctionParticleFactoryEllipseOvalityCosPeaks(
+        material2Id,
+        (input.Particle2.X, input.Particle2.Y),
+        input.Particle2.RotationAngle,
+        input.Particle2.NodeCount,
+        input.Particle2.Radius,
+        input.Particle2.Ovality,
+        input.Particle2.PeakCount,
+        input.Particle2.PeakHeight
+    ).GetParticle(input.Particle2.Id);
+
+    var initialState = new SystemState(Guid.Empty, 0, [particle1, particle2]);
 
-var solver = new SinteringSolver(routines, remeshingEverySteps: 50);
+    ParticlePlot
+        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(initialState.Particles)
+        .SaveHtml("initialState.html");
 
-var plotHandler = new PlotEventHandler();
-solver.SessionInitialized += plotHandler.HandleSessionInitialized;
+    var compactedState = new FocalCompactionStep(
+        new AbsolutePoint(0, 0),
+        stepDistance: 0,
+        minimumIntrusion: 0.5e-6,
+        maxStepCount: 1
+    ).Solve(initialState);
 
-var process = new SinteringStep(
-    input.Duration,
-    input.Temperature,
-    solver,
-    [material1, material2],
-    input.GasConstant
-);
+    ParticlePlot
+        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(compactedState.Particles)
+        .SaveHtml("compactedState.html");
 
-var storage = new ParquetStorage(outputFile);
-process.UseStorage(storage);
+    var routines = SolverRoutines.Default with
+    {
+        Remeshers = YieldRemeshers(),
+        StepWidthController = new MaximumDisplacementAngleStepWidthController(
+            maximumDisplacementAngle: input.TimeStepAngleLimit
+        ),
+    };
 
-try
-{
-    var finalState = process.Solve(compactedState);
-    ParticlePlot
-        .PlotParticles<IParticle<IParticleNode>, IParticleNode>(finalState.Particles)
-        .SaveHtml("finalState.html");
-}
-finally
-{
-    storage.Dispose();
-    Log.CloseAndFlush();
-}
+    var solver = new SinteringSolver(routines, remeshingEverySteps: 50);
 
-IEnumerable<IParticleSystemRemesher> YieldRemeshers()
-{
-    if (input.FreeSurfaceRemesherOptions is not null)
+    var plotHandler = new PlotEventHandler();
+    solver.SessionInitialized += plotHandler.HandleSessionInitialized;
+
+    var process = new SinteringStep(
+        input.Duration,
+        input.Temperature,
+        solver,
+        [material1, material2],
+        input.GasConstant
+    );
+
+    var storage = new ParquetStorage(outputFile);
+    process.UseStorage(storage);
+
+    try
+    {
+        var finalState = process.Solve(compactedState);
+        ParticlePlot
+            .PlotParticles<IParticle<IParticleNode>, IParticleNode>(finalState.Particles)
+            .SaveHtml("finalState.html");
+    }
+    finally
     {
-        yield return new FreeSurfaceRemesher(
-            input.FreeSurfaceRemesherOptions.DeletionLimit,
-            input.FreeSurfaceRemesherOptions.AdditionLimit,
-            input.FreeSurfaceRemesherOptions.MinWidthFactor,
-            input.FreeSurfaceRemesherOptions.MaxWidthFactor,
-            input.FreeSurfaceRemesherOptions.TwinPointLimit,
-            input.FreeSurfaceRemesherOptions.NeckProtectionCount
-        );
+        storage.Dispose();
+        Log.CloseAndFlush();
     }
 
-    yield return new NeckNeighborhoodRemesher(input.NeckDeletionLimit);
+    IEnumerable<IParticleSystemRemesher> YieldRemeshers()
+    {
+        if (input.FreeSurfaceRemesherOptions is not null)
+        {
+            yield return new FreeSurfaceRemesher(
+                input.FreeSurfaceRemesherOptions.DeletionLimit,
+                input.FreeSurfaceRemesherOptions.AdditionLimit,
+                input.FreeSurfaceRemesherOptions.MinWidthFactor,
+                input.FreeSurfaceRemesherOptions.MaxWidthFactor,
+                input.FreeSurfaceRemesherOptions.TwinPointLimit,
+                input.FreeSurfaceRemesherOptions.NeckProtectionCount
+            );
+        }
+
+        yield return new NeckNeighborhoodRemesher(input.NeckDeletionLimit);
+    }
 }
 
 class PlotEventHandler
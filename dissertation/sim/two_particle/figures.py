@@ -0,0 +1,343 @@
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import contour, ticker
+from matplotlib.contour import ContourSet
+from matplotlib.lines import Line2D
+from matplotlib.ticker import LogLocator
+
+from dissertation.config import DEFAULT_FIGSIZE, integer_log_space125
+from dissertation.sim.metrics import Curve
+from dissertation.sim.two_particle.helper import ashby_grid
+from dissertation.sim.two_particle.studies import PARTICLE1_ID, PARTICLE2_ID, DimlessParameterStudy, StudyBase
+
+RESAMPLE_COUNT = 100
+TIME_MIN = 1e-6
+NECK_SIZE_MIN = 2e-1
+SHRINKAGE_MIN = 1e-3
+BAR_WIDTH = 0.3
+
+
+def _save(fig, produces: list[Path]):
+    for p in produces:
+        fig.savefig(p)
+
+    plt.close(fig)
+
+
+def _parameter_colorbar(fig, ax, study_type: type[StudyBase], studies: dict[str, StudyBase]):
+    locs = np.array([s.value for s in studies.values()])
+    cb = fig.colorbar(
+        contour.ContourSet(
+            ax,
+            locs,
+            [[[(0, 0)]]] * len(studies),
+            norm=study_type.axis_scale,
+            cmap=study_type.CMAP,
+        ),
+        label=study_type.TITLE,
+        orientation="vertical",
+        aspect=30,
+    )
+    cb.minorticks_on()
+
+    if study_type.axis_scale == "log":
+        range = np.log10(locs[-1]) - np.log10(locs[0])
+        cb.ax.set_ylim(10 ** (np.log10(locs[0]) - 0.01 * range), 10 ** (np.log10(locs[-1]) + 0.01 * range))
+    else:
+        range = locs[-1] - locs[0]
+        cb.ax.set_yscale("linear")
+        cb.ax.set_ylim(locs[0] - 0.01 * range, locs[-1] + 0.01 * range)
+
+
+def _time_map(
+    produces: list[Path],
+    study_type: type[DimlessParameterStudy],
+    studies: dict[str, DimlessParameterStudy],
+    curves: list[Curve],
+    values: np.ndarray,
+    lower_mag: int,
+    ylabel: str,
+):
+    fig = plt.figure()
+    ax = fig.subplots()
+    ax.set_xscale(study_type.axis_scale)
+    ax.set_yscale("log")
+    ax.grid(True, "both")
+
+    study_params = np.array([s.real_value for s in studies.values()])
+    params = (np.linspace if study_type.axis_scale == "linear" else np.geomspace)(
+        study_params.min(), study_params.max(), RESAMPLE_COUNT
+    )
+    grid_x, grid_y, times = ashby_grid(study_params, curves, params, values)
+
+    locs = integer_log_space125(lower_mag, int(np.floor(np.log10(np.max(times)))))
+    formatter = ticker.LogFormatterSciNotation()
+
+    cs = ax.contour(
+        grid_x,
+        grid_y,
+        times,
+        levels=locs,
+        norm="log",
+        cmap=study_type.CMAP,
+    )
+    cb = fig.colorbar(
+        cs,
+        format=formatter,
+        label="Normalized Time $\\Time / \\TimeNorm_{\\Surface}$",
+        orientation="vertical",
+        aspect=30,
+    )
+    cb.minorticks_on()
+    t_range = np.log10(locs[-1]) - np.log10(locs[0])
+    cb.ax.set_ylim(
+        10 ** (np.log10(locs[0]) - 0.01 * t_range),
+        10 ** (np.log10(locs[-1]) + 0.01 * t_range),
+        auto=False,
+    )
+
+    ax.set_xlabel(study_type.TITLE)
+    ax.set_ylabel(ylabel)
+
+    _save(fig, produces)
+
+
+def plot_neck_size(
+    produces: list[Path], study_type: type[StudyBase], studies: dict[str, StudyBase], curves: dict[str, Curve]
+):
+    fig = plt.figure()
+    ax = fig.subplots()
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.grid(True, "both")
+    max_time = TIME_MIN
+    max_neck_size = NECK_SIZE_MIN
+
+    for key, (times, values) in curves.items():
+        study = studies[key]
+        ax.plot(times, values, label=study.display, **study.line_style)
+        max_time = max(max_time, np.max(times))
+        max_neck_size = max(max_neck_size, np.max(values))
+
+    if issubclass(study_type, DimlessParameterStudy):
+        _parameter_colorbar(fig, ax, study_type, studies)
+    else:
+        ax.legend(title=study_type.TITLE, ncols=3)
+
+    ax.set_xlabel("Normalized Time $\\Time / \\TimeNorm_{\\Surface}$")
+    ax.set_ylabel(r"Relative Neck Size $\Radius_{\Neck} / \Radius_0$")
+    ax.set_xlim(TIME_MIN, max_time)
+    ax.set_ylim(NECK_SIZE_MIN, min(10 ** np.ceil(np.log10(max_neck_size)), 1.3))
+
+    _save(fig, produces)
+
+
+def plot_neck_size_map(
+    produces: list[Path],
+    study_type: type[DimlessParameterStudy],
+    studies: dict[str, DimlessParameterStudy],
+    curves: dict[str, Curve],
+):
+    max_neck_size = np.max([np.max(n) for _, n in curves.values()])
+    neck_sizes = np.geomspace(NECK_SIZE_MIN, min(10 ** np.ceil(np.log10(max_neck_size)), 1.3), RESAMPLE_COUNT)
+    _time_map(
+        produces,
+        study_type,
+        studies,
+        list(curves.values()),
+        neck_sizes,
+        -6,
+        r"Relative Neck Size $\Radius_{\Neck} / \Radius_0$",
+    )
+
+
+def plot_shrinkage(
+    produces: list[Path], study_type: type[StudyBase], studies: dict[str, StudyBase], curves: dict[str, Curve]
+):
+    fig = plt.figure()
+    ax = fig.subplots()
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.grid(True, "both")
+    max_time = TIME_MIN
+    max_shrinkage = SHRINKAGE_MIN
+
+    for key, (times, values) in curves.items():
+        study = studies[key]
+        ax.plot(times, values, label=study.display, **study.line_style)
+        max_time = max(max_time, np.max(times))
+        max_shrinkage = max(max_shrinkage, np.max(values))
+
+    if issubclass(study_type, DimlessParameterStudy):
+        _parameter_colorbar(fig, ax, study_type, studies)
+    else:
+        ax.legend(title=study_type.TITLE, ncols=3)
+
+    ax.set_xlabel("Normalized Time $\\Time / \\TimeNorm_{\\Surface}$")
+    ax.set_ylabel("Shrinkage $\\Shrinkage$")
+    ax.set_xlim(TIME_MIN, max_time)
+    ax.set_ylim(SHRINKAGE_MIN, min(10 ** np.ceil(np.log10(max_shrinkage)), 0.3))
+
+    _save(fig, produces)
+
+
+def plot_shrinkage_map(
+    produces: list[Path],
+    study_type: type[DimlessParameterStudy],
+    studies: dict[str, DimlessParameterStudy],
+    curves: dict[str, Curve],
+):
+    max_shrinkage = np.max([np.max(s) for _, s in curves.values()])
+    shrinkages = np.geomspace(SHRINKAGE_MIN, min(10 ** np.ceil(np.log10(max_shrinkage)), 0.3), RESAMPLE_COUNT)
+    _time_map(
+        produces,
+        study_type,
+        studies,
+        list(curves.values()),
+        shrinkages,
+        int(np.floor(np.log10(TIME_MIN))),
+        "Shrinkage $\\Shrinkage$",
+    )
+
+
+def plot_volume_loss(
+    produces: list[Path],
+    study_type: type[StudyBase],
+    studies: dict[str, StudyBase],
+    volume_losses: dict[str, dict[bytes, Curve]],
+):
+    fig = plt.figure(dpi=600)
+    ax = fig.subplots()
+    ax.set_xscale("log")
+    ax.set_yscale("asinh")
+    ax.grid(True)
+    ax.grid(True, "both", "y")
+
+    for key, losses in volume_losses.items():
+        study = studies[key]
+        ax.plot(*losses[PARTICLE1_ID.bytes], **study.line_style, markevery=0.1, marker="x")
+        ax.plot(*losses[PARTICLE2_ID.bytes], **study.line_style, markevery=0.1, marker="+")
+
+    legend_items = [Line2D([], [], **study.line_style, label=study.display) for study in studies.values()]
+    ax.add_artist(ax.legend(title=study_type.TITLE, ncols=3, handles=legend_items, loc="upper left"))
+    ax.legend(
+        handles=[
+            Line2D([], [], color="k", marker="x", lw=0, label="Particle 1"),
+            Line2D([], [], color="k", marker="+", lw=0, label="Particle 2"),
+        ],
+        loc="upper right",
+    )
+    ax.set_xlabel(r"Normalized Time $\Time / \TimeNorm_{\Surface}$")
+    ax.set_ylabel(r"Relative Volume Loss $(\Volume - \Volume_0) / \Volume_0$")
+    ax.set_ylim(-1e-3, 1e-3)
+
+    _save(fig, produces)
+
+
+def plot_time_step_width(
+    produces: list[Path], study_type: type[StudyBase], studies: dict[str, StudyBase], curves: dict[str, Curve]
+):
+    fig = plt.figure(dpi=600)
+    ax = fig.subplots()
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.grid(True)
+
+    for key, (times, values) in curves.items():
+        study = studies[key]
+        ax.plot(times, values, label=study.display, **study.line_style)
+
+    ax.legend(title=study_type.TITLE, ncols=3)
+    ax.set_xlabel("Normalized Time $\\Time / \\TimeNorm_{\\Surface}$")
+    ax.set_ylabel("Time Step Width $\\Diff\\Time / \\TimeNorm_{\\Surface}$")
+
+    _save(fig, produces)
+
+
+def plot_step_count_and_durations(
+    produces: list[Path],
+    study_type: type[StudyBase],
+    studies: dict[str, StudyBase],
+    step_counts: dict[str, int],
+    durations: dict[str, float],
+):
+    fig = plt.figure(dpi=600)
+    ax = fig.subplots()
+    ax2 = ax.twinx()
+
+    categories = [s.display.replace("/", "\n") for s in studies.values()]
+
+    ax.bar(categories, list(step_counts.values()), label="Step Count", color="C0", width=BAR_WIDTH, align="edge")
+    ax2.bar(
+        categories, list(durations.values()), label="Simulation Duration", color="C1", width=-BAR_WIDTH, align="edge"
+    )
+
+    ax.set_xlabel(study_type.TITLE)
+    ax.set_ylabel("Step Count", color="C0")
+    ax.tick_params(axis="y", labelcolor="C0")
+    ax2.set_ylabel(r"Simulation Duration in $\unit{\second}$", color="C1")
+    ax2.tick_params(axis="y", labelcolor="C1")
+    ax2.grid(True)
+    ax.set_yscale("log")
+    ax2.set_yscale("log")
+
+    _save(fig, produces)
+
+
+def plot_evolution(produces: list[Path], study: StudyBase, times: np.ndarray, x: np.ndarray, y: np.ndarray):
+    """Outlines of both particles at the given normalized times.
+
+    ``x`` and ``y`` are states × particles arrays of node coordinates in µm holding the initial state followed by the
+    states at ``times``.
+    """
+    if "tip_tip" in study.KEY:
+        fig = plt.figure(figsize=tuple(DEFAULT_FIGSIZE * [1, 0.8]))
+    elif "flank_flank" in study.KEY:
+        fig = plt.figure(figsize=tuple(DEFAULT_FIGSIZE * [1, 1.4]))
+    else:
+        fig = plt.figure()
+    ax = fig.subplots()
+    ax.set_aspect("equal", adjustable="datalim", anchor="S")
+
+    cs = ContourSet(
+        ax,
+        times,
+        [
+            [
+                np.pad(np.transpose([x[i, 0], y[i, 0]]), [(0, 1), (0, 0)], mode="wrap"),
+                np.pad(np.transpose([x[i, 1], y[i, 1]]), [(0, 1), (0, 0)], mode="wrap"),
+            ]
+            for i in range(1, len(times) + 1)
+        ],
+        cmap="viridis",
+        norm="log",
+    )
+    cb = fig.colorbar(
+        cs,
+        orientation="vertical",
+        ticks=LogLocator(),
+        label="Normalized Time $\\Time / \\TimeNorm_{\\Surface}$",
+        aspect=30,
+    )
+    cb.minorticks_on()
+    t_range = np.log10(times[-1]) - np.log10(times[0])
+    cb.ax.set_ylim(
+        10 ** (np.log10(times[0]) - 0.01 * t_range),
+        10 ** (np.log10(times[-1]) + 0.01 * t_range),
+        auto=False,
+    )
+
+    ax.set_xlabel("$x$ in \\unit{\\micro\\meter}")
+    ax.set_ylabel("$y$ in \\unit{\\micro\\meter}")
+
+    fig.draw_without_rendering()
+    yx_ratio = (ax.get_ylim()[1] - ax.get_ylim()[0]) / (ax.get_xlim()[1] - ax.get_xlim()[0])
+    mid_x = np.max(x[0, 0])
+    x_dist = 100
+    ax.set_xlim(mid_x - x_dist, mid_x + x_dist)
+    ax.set_ylim(0, yx_ratio * 2 * x_dist)
+    ax.grid(True)
+
+    _save(fig, produces)
@@ -0,0 +1,86 @@
+import argparse
+import json
+from collections.abc import Sequence
+
+import numpy as np
+
+from dissertation.sim.metrics import extract
+from dissertation.sim.two_particle.studies import REFINEMENTS_FILE, STUDIES, DimlessParameterStudy, load_refinements
+
+LEVEL_COUNT = 50
+LEVEL_MIN = dict(neck_size=2e-1, shrinkage=1e-3)
+
+
+def times_to_levels(curves: Sequence[tuple[np.ndarray, np.ndarray]], levels: np.ndarray) -> np.ndarray:
+    """log10 of the times the curves reach the given levels, NaN where a curve does not reach a level"""
+    log_times = np.full((len(curves), len(levels)), np.nan)
+    for i, (times, values) in enumerate(curves):
+        reached = levels <= np.max(values)
+        log_times[i, reached] = np.log10(np.interp(levels[reached], values, times))
+    return log_times
+
+
+def propose(
+    study_type: type[DimlessParameterStudy],
+    metric: str,
+    tolerance: float,
+    max_new: int,
+    min_width: float = 1e-3,
+) -> list[float]:
+    """Propose new sweep values in the intervals where the time to reach a metric level changes fastest.
+
+    The change between neighbouring points is measured as the maximum difference in decades of time over all
+    levels of the metric. Intervals exceeding ``tolerance`` are bisected in axis scale, largest change first, as
+    long as they are wider than ``min_width`` relative to the sweep range. Points without results yet are skipped.
+    """
+    studies = [s for s in study_type.INSTANCES if (s.dir / "summary.parquet").exists()]
+    if len(studies) < 2:
+        return []
+
+    curves = [extract(s.dir / "summary.parquet", s.metric_spec, [metric])[metric] for s in studies]
+    top = max(np.max(v) for _, v in curves)
+    levels = np.geomspace(LEVEL_MIN[metric], top, LEVEL_COUNT)
+    log_times = times_to_levels(curves, levels)
+
+    log_axis = study_type.axis_scale == "log"
+    x = np.array([s.value for s in studies])
+    x = np.log(x) if log_axis else x
+    width = min_width * (x[-1] - x[0])
+
+    changes = np.abs(np.diff(log_times, axis=0))
+    changes = np.nanmax(np.where(np.isnan(changes), -np.inf, changes), axis=1)
+
+    candidates = [i for i in np.argsort(changes)[::-1] if changes[i] > tolerance and x[i + 1] - x[i] > 2 * width]
+    midpoints = [(x[i] + x[i + 1]) / 2 for i in candidates[:max_new]]
+    return [round(float(np.exp(m) if log_axis else m), 5) for m in midpoints]
+
+
+def main(argv: Sequence[str] | None = None):
+    dimless_studies = {t.KEY: t for t in STUDIES if issubclass(t, DimlessParameterStudy)}
+
+    parser = argparse.ArgumentParser(description="Propose refinement points of the dimensionless parameter sweeps.")
+    parser.add_argument("studies", nargs="*", default=list(dimless_studies), help="keys of the studies to refine")
+    parser.add_argument("-m", "--metric", choices=list(LEVEL_MIN), default="neck_size", help="metric of the map")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1, help="tolerated change in decades of time")
+    parser.add_argument("-n", "--max-new", type=int, default=4, help="maximum count of new points per study")
+    parser.add_argument("-w", "--write", action="store_true", help=f"add the proposals to {REFINEMENTS_FILE.name}")
+    args = parser.parse_args(argv)
+
+    refinements = load_refinements()
+
+    for key in args.studies:
+        study_type = dimless_studies[key]
+        if not any((s.dir / "summary.parquet").exists() for s in study_type.INSTANCES):
+            print(f"{key}: no results yet")
+            continue
+
+        proposals = propose(study_type, args.metric, args.tolerance, args.max_new)
+        print(f"{key}: {proposals if proposals else 'converged'}")
+        refinements[key] = sorted(set(refinements.get(key, [])) | set(proposals))
+
+    if args.write:
+        REFINEMENTS_FILE.write_text(json.dumps({k: v for k, v in refinements.items() if v}, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from dissertation.config import image_produces
+from dissertation.sim.metrics import Curve, extract
+from dissertation.sim.scheduling import in_parallel_build, task_cores
+from dissertation.sim.state_index import load_state_index, read_particle_outlines
+from dissertation.sim.two_particle.figures import (
+    TIME_MIN,
+    plot_neck_size,
+    plot_neck_size_map,
+    plot_shrinkage,
+    plot_shrinkage_map,
+    plot_step_count_and_durations,
+    plot_time_step_width,
+    plot_volume_loss,
+)
+from dissertation.sim.two_particle.studies import PARTICLE1_ID, PARTICLE2_ID, DimlessParameterStudy, StudyBase
+
+METRICS = ["neck_size", "shrinkage", "volume_loss", "time_steps", "step_count"]
+EVOLUTION_STATE_COUNT = 10
+
+
+@dataclass(frozen=True)
+class StudyData:
+    """Everything the summary-level figures need of one study, loaded once and shared by all of them."""
+
+    metrics: dict
+    duration: float
+
+
+def load_evolution(output_file: Path, state_index: Path, study: StudyBase) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Normalized times to plot and particle outlines in µm of the initial and the plotted states.
+
+    Only the plotted states are read from the output, located through its state index.
+    """
+    index = load_state_index(state_index)
+    states = np.flatnonzero(index.monotonic & (index.times > 1))
+    times = index.times[states] / study.input.time_norm_surface
+
+    times_to_plot = np.geomspace(TIME_MIN, times[-1], EVOLUTION_STATE_COUNT)
+    plotted = states[np.searchsorted(times, times_to_plot)]
+    positions = np.unique(np.append(plotted, states[0]))
+
+    _, x, y = read_particle_outlines(output_file, [PARTICLE1_ID.bytes, PARTICLE2_ID.bytes], index, positions)
+    order = np.searchsorted(positions, [states[0], *plotted])
+    return times_to_plot, x[order] * 1e6, y[order] * 1e6
+
+
+def load_study(study: StudyBase) -> StudyData:
+    return StudyData(
+        extract(study.dir / "summary.parquet", study.metric_spec, METRICS),
+        float((study.dir / "time.txt").read_text()),
+    )
+
+
+def figure_produces(study_type: type[StudyBase]) -> dict[str, list[Path]]:
+    names = ["neck_size", "shrinkage", "volume_loss", "time_step_width", "step_count"]
+    if issubclass(study_type, DimlessParameterStudy):
+        names += ["neck_size_map", "shrinkage_map"]
+
+    return {n: image_produces(study_type.DIR / n) for n in names}
+
+
+def figure_jobs(
+    study_type: type[StudyBase], data: dict[str, StudyData], produces: dict[str, list[Path]]
+) -> list[tuple[Callable, tuple]]:
+    """figure functions with their arguments, all taken from the already loaded study data"""
+    studies = {s.key: s for s in study_type.INSTANCES}
+
+    def metric(name: str) -> dict[str, Curve]:
+        return {k: d.metrics[name] for k, d in data.items()}
+
+    jobs = [
+        (plot_neck_size, (produces["neck_size"], study_type, studies, metric("neck_size"))),
+        (plot_shrinkage, (produces["shrinkage"], study_type, studies, metric("shrinkage"))),
+        (plot_volume_loss, (produces["volume_loss"], study_type, studies, metric("volume_loss"))),
+        (plot_time_step_width, (produces["time_step_width"], study_type, studies, metric("time_steps"))),
+        (
+            plot_step_count_and_durations,
+            (
+                produces["step_count"],
+                study_type,
+                studies,
+                metric("step_count"),
+                {k: d.duration for k, d in data.items()},
+            ),
+        ),
+    ]
+
+    if issubclass(study_type, DimlessParameterStudy):
+        jobs += [
+            (plot_neck_size_map, (produces["neck_size_map"], study_type, studies, metric("neck_size"))),
+            (plot_shrinkage_map, (produces["shrinkage_map"], study_type, studies, metric("shrinkage"))),
+        ]
+
+    return jobs
+
+
+def render_study_type(study_type: type[StudyBase], produces: dict[str, list[Path]], workers: int | None = None):
+    """Load the summary data of all studies of a type once and render all their figures from it.
+
+    In a serial build the figures are rendered in a process pool over the available cores. It uses the forkserver
+    start method, as forking after the data was loaded with pyarrow's thread pools is unsafe. Within the workers of
+    pytask-parallel, nested pools fail to start, so the figures are rendered one after another there.
+    """
+    data = {s.key: load_study(s) for s in study_type.INSTANCES}
+    jobs = figure_jobs(study_type, data, produces)
+    workers = 1 if in_parallel_build() else min(task_cores() if workers is None else workers, len(jobs))
+
+    if workers == 1:
+        for f, args in jobs:
+            f(*args)
+        return
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("forkserver")) as pool:
+        futures = [pool.submit(f, *args) for f, args in jobs]
+        for future in futures:
+            future.result()
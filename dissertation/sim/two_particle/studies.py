@@ -1,4 +1,5 @@
 import itertools
+import json
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from pathlib import Path
@@ -11,6 +12,7 @@ import numpy as np
 from pydantic import BaseModel, ConfigDict
 
 from dissertation.config import in_build_dir
+from dissertation.sim.metrics import MetricSpec
 from dissertation.sim.two_particle.input import (
     FreeSurfaceRemesherOptions,
     Input,
@@ -20,6 +22,7 @@ from dissertation.sim.two_particle.input import (
 )
 
 THIS_DIR = Path(__file__).parent
+REFINEMENTS_FILE = THIS_DIR / "refinements.json"
 
 PARTICLE1_ID = UUID("989b9875-2a6b-40c3-ab2f-5ebc96682dbe")
 PARTICLE2_ID = UUID("10cac1cc-6205-4b91-85b4-4e9d6f126274")
@@ -59,6 +62,16 @@ BASE_INPUT = Input(
 )
 
 
+def load_refinements() -> dict[str, list[float]]:
+    """additional sweep values per study key, as proposed by the adaptive refinement"""
+    if not REFINEMENTS_FILE.exists():
+        return {}
+    return json.loads(REFINEMENTS_FILE.read_text())
+
+
+REFINEMENTS = load_refinements()
+
+
 class StudyBase(BaseModel, ABC):
     model_config = ConfigDict(frozen=True)
 
@@ -95,6 +108,15 @@ class StudyBase(BaseModel, ABC):
     def line_style(self) -> dict:
         """return repective line style for plot"""
 
+    @property
+    def metric_spec(self) -> MetricSpec:
+        return MetricSpec(
+            time_norm=self.input.time_norm_surface,
+            radius=self.input.particle1.radius,
+            particles=(PARTICLE1_ID.bytes, PARTICLE2_ID.bytes),
+            neck_particles=(PARTICLE1_ID.bytes,),
+        )
+
 
 class TimeStepStudy(StudyBase):
     KEY = "time_step"
@@ -259,6 +281,8 @@ class DimlessParameterStudy(StudyBase, ABC):
     MAX: ClassVar[float]
     COUNT: ClassVar[int] = 11
     SCALE: ClassVar[Literal["lin", "log", "geom"]]
+    # additional sweep points besides the regular grid, e.g. refinements or range extensions
+    EXTRA_VALUES: ClassVar[list[float]] = []
 
     value: float
 
@@ -282,13 +306,15 @@ class DimlessParameterStudy(StudyBase, ABC):
 
     @property
     def line_style(self) -> dict:
+        values = type(self).values
+        lower, upper = values[0], values[-1]
         if self.SCALE == "lin" or self.SCALE == "log":
             return dict(
-                color=type(self).CMAP((self.value - self.MIN) / (self.MAX - self.MIN)),
+                color=type(self).CMAP((self.value - lower) / (upper - lower)),
             )
         if self.SCALE == "geom":
             return dict(
-                color=type(self).CMAP((np.log(self.value) - np.log(self.MIN)) / (np.log(self.MAX) - np.log(self.MIN))),
+                color=type(self).CMAP((np.log(self.value) - np.log(lower)) / (np.log(upper) - np.log(lower))),
             )
         raise ValueError()
 
@@ -302,7 +328,7 @@ class DimlessParameterStudy(StudyBase, ABC):
 
     @classmethod
     @property
-    def values(cls) -> np.ndarray:
+    def grid_values(cls) -> np.ndarray:
         if cls.SCALE == "lin":
             return np.linspace(cls.MIN, cls.MAX, cls.COUNT, True)
         if cls.SCALE == "geom":
@@ -312,6 +338,18 @@ class DimlessParameterStudy(StudyBase, ABC):
 
         raise ValueError()
 
+    @classmethod
+    @property
+    def values(cls) -> np.ndarray:
+        """sorted grid and extra values, where extra values coinciding with a grid point's key are dropped
+
+        Points are identified by their key, so existing points keep their key and results when the sweep is extended.
+        """
+        values = {f"{v:.5f}": v for v in cls.grid_values}
+        for v in [*cls.EXTRA_VALUES, *REFINEMENTS.get(cls.KEY, [])]:
+            values.setdefault(f"{v:.5f}", v)
+        return np.sort(list(values.values()))
+
     @classmethod
     @property
     def axis_scale(cls) -> str:
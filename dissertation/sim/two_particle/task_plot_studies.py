@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from pytask import mark, task
+
+from dissertation.sim.two_particle.rendering import figure_produces, render_study_type
+from dissertation.sim.two_particle.studies import STUDIES, StudyBase
+
+THIS_DIR = Path(__file__).parent
+
+for t in STUDIES:
+
+    @task(id=f"{t.KEY}")
+    @mark.plot
+    def task_plot_studies(
+        study_type: type[StudyBase] = t,
+        summary_files={s.key: s.dir / "summary.parquet" for s in t.INSTANCES},
+        time_files={s.key: s.dir / "time.txt" for s in t.INSTANCES},
+        figures_module=THIS_DIR / "figures.py",
+        rendering_module=THIS_DIR / "rendering.py",
+        produces=figure_produces(t),
+    ):
+        render_study_type(study_type, produces)
@@ -1,11 +1,14 @@
-import subprocess
-import time
 from pathlib import Path
 
 from pytask import mark, task
-from rich.markup import escape
 
+from dissertation.sim.output import write_flat_cache
+from dissertation.sim.projects import executable
+from dissertation.sim.scheduling import estimate_cost, estimate_memory
+from dissertation.sim.state_index import build_state_index, index_file, write_state_index
+from dissertation.sim.summary import write_summary
 from dissertation.sim.two_particle.studies import STUDIES
+from dissertation.sim.worker import run_simulation
 
 THIS_DIR = Path(__file__).parent
 
@@ -25,35 +28,34 @@ for t in STUDIES:
 
         @task(id=study.key)
         @mark.persist
-        @mark.sim
+        @mark.sim(cost=estimate_cost(study.input), memory=estimate_memory(study.input))
         def task_run(
             input_file=study.dir / "input.json",
             produces={"output": study.dir / "output.parquet", "time": study.dir / "time.txt"},
-            csharp_proj=THIS_DIR / "two_particle.csproj",
+            solver=executable("two_particle"),
+        ):
+            run_simulation(solver, input_file, produces)
+
+        @task(id=study.key)
+        @mark.sim
+        def task_summarize(
+            results_file=study.dir / "output.parquet",
+            produces=study.dir / "summary.parquet",
+        ):
+            write_summary(results_file, produces)
+
+        @task(id=study.key)
+        @mark.sim
+        def task_cache_output(
+            results_file=study.dir / "output.parquet",
+            produces=study.dir / "output.arrow",
+        ):
+            write_flat_cache(results_file, produces)
+
+        @task(id=study.key)
+        @mark.sim
+        def task_index_output(
+            results_file=study.dir / "output.arrow",
+            produces=index_file(study.dir / "output.arrow"),
         ):
-            start = time.time()
-            result = subprocess.run(
-                [
-                    "dotnet",
-                    "run",
-                    "-c",
-                    "Release",
-                    "--project",
-                    str(csharp_proj),
-                    str(input_file),
-                    str(produces["output"]),
-                ],
-                cwd=str(input_file.parent),
-                check=False,
-                capture_output=True,
-                text=True,
-            )
-
-            end = time.time()
-
-            print("=== OUT ===\n", escape(result.stdout))
-            print("=== ERR ===\n", escape(result.stderr))
-
-            produces["time"].write_text(str(end - start))
-
-            result.check_returncode()
+            write_state_index(build_state_index(results_file), produces)
@@ -0,0 +1,241 @@
+import atexit
+import json
+import os
+import subprocess
+import threading
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from rich.markup import escape
+
+from dissertation.config import in_build_dir
+from dissertation.sim.cache import cache_key, restore, store
+
+RESPONSE_PREFIX = "#worker:"
+CORE_LOCK_DIR = in_build_dir(Path(__file__).parent / "cores")
+
+
+class SimulationError(RuntimeError):
+    pass
+
+
+@dataclass
+class SimulationResult:
+    success: bool
+    duration: float
+    error: str | None
+    stdout: str = ""
+    stderr: str = ""
+
+    def check(self):
+        if not self.success:
+            raise SimulationError(self.error)
+
+
+class SimulationWorker:
+    """Long-lived solver process which runs one simulation job after the other.
+
+    Jobs are sent as JSON lines over stdin, the solver answers each job with a single line starting with
+    ``RESPONSE_PREFIX``. Everything else written to stdout in between is the log of the respective job.
+    """
+
+    def __init__(self, command: Sequence[str], cwd: Path):
+        self.command = list(command)
+        self.cwd = cwd
+        self._process: subprocess.Popen | None = None
+        self._stderr: list[str] = []
+        self._core: int | None = None
+        self._core_lock: IO | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        if self._core_lock is None:
+            self._core, self._core_lock = claim_core()
+
+        core = self._core
+        self._process = subprocess.Popen(
+            self.command,
+            cwd=str(self.cwd),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        # pinned after the start, as preexec_fn is unsafe in the multi-threaded parent
+        if core is not None:
+            os.sched_setaffinity(self._process.pid, {core})
+        self._stderr = []
+        threading.Thread(target=_drain, args=(self._process.stderr, self._stderr), daemon=True).start()
+
+    def close(self):
+        if self._process is None:
+            return
+
+        if self.alive:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+        self._process = None
+
+        if self._core_lock is not None:
+            self._core_lock.close()
+            self._core, self._core_lock = None, None
+
+    def run(self, input_text: str, output_file: Path, working_dir: Path) -> SimulationResult:
+        if not self.alive:
+            self.start()
+
+        job = dict(input=input_text, output=str(output_file), working_directory=str(working_dir))
+        stdout = []
+
+        try:
+            self._process.stdin.write(json.dumps(job) + "\n")
+            self._process.stdin.flush()
+
+            for line in self._process.stdout:
+                if line.startswith(RESPONSE_PREFIX):
+                    response = json.loads(line.removeprefix(RESPONSE_PREFIX))
+                    return SimulationResult(**response, stdout="".join(stdout), stderr=self._take_stderr())
+                stdout.append(line)
+        except BrokenPipeError:
+            pass
+
+        return_code = self._process.wait()
+        self._process = None
+        return SimulationResult(
+            success=False,
+            duration=float("nan"),
+            error=f"Simulation worker exited unexpectedly with return code {return_code}.",
+            stdout="".join(stdout),
+            stderr=self._take_stderr(),
+        )
+
+    def _take_stderr(self) -> str:
+        lines, self._stderr[:] = self._stderr[:], []
+        return "".join(lines)
+
+
+def claim_core() -> tuple[int | None, IO | None]:
+    """Claim a CPU core not used by any other worker, also across the processes of a parallel build.
+
+    Returns the core and the open lock file, which has to be kept open as long as the core is in use.
+    Pinning is skipped if the platform does not support it or all cores are taken.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None, None
+
+    import fcntl
+
+    CORE_LOCK_DIR.mkdir(parents=True, exist_ok=True)
+
+    for core in sorted(os.sched_getaffinity(0)):
+        lock = (CORE_LOCK_DIR / f"{core}.lock").open("w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            continue
+        return core, lock
+
+    return None, None
+
+
+def _drain(stream: IO[str], buffer: list[str]):
+    for line in stream:
+        buffer.append(line)
+
+
+_IDLE_WORKERS: dict[tuple[str, ...], list[SimulationWorker]] = defaultdict(list)
+_LOCK = threading.Lock()
+
+
+@contextmanager
+def acquire_worker(command: Sequence[str], cwd: Path) -> Iterator[SimulationWorker]:
+    """Borrow an idle worker for the given command or start a new one, if all are busy.
+
+    The worker only returns to the idle ones if the block succeeds, one left in an unknown state is closed.
+    """
+    key = tuple(command)
+
+    with _LOCK:
+        worker = _IDLE_WORKERS[key].pop() if _IDLE_WORKERS[key] else SimulationWorker(command, cwd)
+
+    try:
+        yield worker
+    except BaseException:
+        worker.close()
+        raise
+
+    with _LOCK:
+        _IDLE_WORKERS[key].append(worker)
+
+
+@atexit.register
+def close_workers():
+    with _LOCK:
+        for workers in _IDLE_WORKERS.values():
+            for w in workers:
+                w.close()
+        _IDLE_WORKERS.clear()
+
+
+def worker_command(solver: Path) -> list[str]:
+    return [str(solver), "--worker"]
+
+
+def run_job(worker: SimulationWorker, solver: Path, input_text: str, produces: dict[str, Path]) -> SimulationResult:
+    """Run a simulation, or reuse the output of an earlier run of the same input with the same solver."""
+    key = cache_key(input_text, solver)
+
+    if (duration := restore(key, produces["output"])) is not None:
+        result = SimulationResult(success=True, duration=duration, error=None, stdout=f"Reused cached result {key}.\n")
+    else:
+        # never write through a hard link into the cache
+        produces["output"].unlink(missing_ok=True)
+        result = worker.run(input_text, produces["output"], produces["output"].parent)
+        if result.success:
+            store(key, input_text, produces["output"], result.duration)
+
+    produces["time"].write_text(str(result.duration))
+    return result
+
+
+def print_result(result: SimulationResult):
+    print("=== OUT ===\n", escape(result.stdout))
+    print("=== ERR ===\n", escape(result.stderr))
+
+
+def run_simulation(solver: Path, input_file: Path, produces: dict[str, Path]):
+    with acquire_worker(worker_command(solver), solver.parent) as worker:
+        result = run_job(worker, solver, input_file.read_text(encoding="utf-8"), produces)
+
+    print_result(result)
+    result.check()
+
+
+def run_batch(solver: Path, jobs: Sequence[tuple[str, dict[str, Path]]]) -> list[SimulationResult]:
+    """Run several simulations one after the other on the same worker.
+
+    Jobs are given as pairs of input JSON and products. Failing jobs do not abort the batch, the caller has to inspect the returned results.
+    """
+    results = []
+
+    with acquire_worker(worker_command(solver), solver.parent) as worker:
+        for input_text, produces in jobs:
+            result = run_job(worker, solver, input_text, produces)
+            print_result(result)
+            results.append(result)
+
+    return results